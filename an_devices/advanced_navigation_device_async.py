@@ -0,0 +1,236 @@
+################################################################################
+##                                                                            ##
+##                   Advanced Navigation Python Language SDK                  ##
+##                       advanced_navigation_device_async.py                  ##
+##                     Copyright 2023, Advanced Navigation                    ##
+##                                                                            ##
+################################################################################
+#                                                                              #
+# Copyright (C) 2023 Advanced Navigation                                       #
+#                                                                              #
+# Permission is hereby granted, free of charge, to any person obtaining        #
+# a copy of this software and associated documentation files (the "Software"), #
+# to deal in the Software without restriction, including without limitation    #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,     #
+# and/or sell copies of the Software, and to permit persons to whom the        #
+# Software is furnished to do so, subject to the following conditions:         #
+#                                                                              #
+# The above copyright notice and this permission notice shall be included      #
+# in all copies or substantial portions of the Software.                       #
+#                                                                              #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS      #
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,  #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE  #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER       #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING      #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER          #
+# DEALINGS IN THE SOFTWARE.                                                    #
+################################################################################
+
+import asyncio
+from typing import Dict, List, Optional, Union
+
+from anpp_packets.an_packets import PacketID
+from anpp_packets.an_packet_protocol import ANDecoder
+from anpp_packets.an_packet_1 import RequestPacket
+from anpp_packets.an_packet_dispatch import dispatcher_for_class
+
+ASYNC_READ_SIZE = 4096    # Bytes requested from the stream per read
+ASYNC_QUEUE_SIZE = 1024   # Packets held for packets() before the oldest is dropped
+ASYNC_TIMEOUT = 1.0       # Seconds to wait for a response or acknowledge
+
+
+class AdvancedNavigationDeviceAsync:
+    """asyncio device layer for Advanced Navigation devices over TCP or serial.
+
+    A single read task per device feeds the stream into the decoder and hands
+    every packet to waiting request or send calls and to the packets() queue,
+    so one event loop can service several devices side by side. Packets are
+    decoded with the packet classes of device_class, for example Spatial."""
+
+    def __init__(
+        self,
+        device_class: type,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        queue_size: int = ASYNC_QUEUE_SIZE,
+        typed: bool = True,
+    ):
+        self.device_class = device_class
+        self.reader = reader
+        self.writer = writer
+        self.typed = typed
+        self.decoder = ANDecoder()
+        self.dispatcher = dispatcher_for_class(device_class)
+        self.packet_queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.dropped_packets = 0
+        self.decode_errors = 0
+        self.read_error: Optional[BaseException] = None
+        # Futures waiting for a packet, by packet ID, or for an acknowledge,
+        # by (acknowledge ID, acknowledged packet ID)
+        self.waiters: Dict[Union[int, tuple], List[asyncio.Future]] = {}
+        self.read_task: Optional[asyncio.Task] = None
+        self.closed = False
+
+    @classmethod
+    async def open_tcp(cls, device_class: type, address: str, port: int, **kwargs):
+        """Connects to a device over TCP"""
+        reader, writer = await asyncio.open_connection(address, port)
+        return cls(device_class, reader, writer, **kwargs)
+
+    @classmethod
+    async def open_serial(cls, device_class: type, port: str, baud: int, **kwargs):
+        """Opens a serial device. Requires the pyserial-asyncio package."""
+        if int(baud) not in device_class.valid_baud_rates:
+            raise ValueError(f"Baud Rate:{baud} is not valid")
+        try:
+            import serial_asyncio
+        except ImportError:
+            raise ImportError("open_serial requires pyserial-asyncio") from None
+        reader, writer = await serial_asyncio.open_serial_connection(
+            url=port, baudrate=int(baud)
+        )
+        return cls(device_class, reader, writer, **kwargs)
+
+    def start(self):
+        """Starts the read task, done automatically by packets, request and
+        send. A closed device is not restarted."""
+        if self.read_task is None and not self.closed:
+            self.read_task = asyncio.get_running_loop().create_task(self.read_loop())
+
+    def is_open(self):
+        return not self.closed and not self.writer.is_closing() and not (
+            self.read_task is not None and self.read_task.done()
+        )
+
+    async def close(self):
+        self.closed = True
+        if self.read_task is None:
+            # End packets() iterators that never started the read task
+            self.queue_packet(None)
+        else:
+            self.read_task.cancel()
+            try:
+                await self.read_task
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                # The read task already failed, the error is in read_error
+                pass
+        self.writer.close()
+        await self.writer.wait_closed()
+
+    def decode_typed(self, an_packet):
+        """Decodes an ANPacket into the packet class the device uses for its
+        packet ID and length. Returns None if the packet is unknown to the
+        device or fails to decode."""
+        return self.dispatcher.decode(an_packet)
+
+    async def read_loop(self):
+        try:
+            while True:
+                data = await self.reader.read(ASYNC_READ_SIZE)
+                if not data:
+                    break
+                self.decoder.add_data(data)
+                for an_packet in self.decoder.decode_all():
+                    # A packet that fails to decode is dropped, not fatal
+                    try:
+                        self.dispatch(an_packet)
+                    except Exception as e:
+                        print(f"exception decoding packet {an_packet.id} : {e}")
+                        self.decode_errors += 1
+        except (ConnectionError, OSError) as e:
+            print(f"exception in read : {e}")
+        except Exception as e:
+            print(f"exception in read : {e}")
+            self.read_error = e
+        finally:
+            # Wake up everyone waiting, the stream has ended
+            for futures in self.waiters.values():
+                for future in futures:
+                    if not future.done():
+                        error = ConnectionError("Device disconnected")
+                        error.__cause__ = self.read_error
+                        future.set_exception(error)
+            self.waiters.clear()
+            self.queue_packet(None)
+
+    def dispatch(self, an_packet):
+        packet = self.decode_typed(an_packet)
+        if packet is None and self.dispatcher.is_known(an_packet.id):
+            # A known packet with a bad length or field value
+            self.decode_errors += 1
+        if packet is not None:
+            if an_packet.id == PacketID.acknowledge:
+                key = (int(PacketID.acknowledge), int(packet.packet_id))
+            else:
+                key = int(an_packet.id)
+            for future in self.waiters.pop(key, ()):
+                if not future.done():
+                    future.set_result(packet)
+
+        if self.typed:
+            if packet is not None:
+                self.queue_packet(packet)
+        else:
+            self.queue_packet(an_packet)
+
+    def queue_packet(self, packet):
+        while True:
+            try:
+                self.packet_queue.put_nowait(packet)
+                return
+            except asyncio.QueueFull:
+                self.packet_queue.get_nowait()
+                self.dropped_packets += 1
+
+    async def packets(self):
+        """Yields every received packet until the device disconnects, for use
+        as async for packet in device.packets(). Returns at once once the
+        device has disconnected or is closed."""
+        self.start()
+        while True:
+            packet = await self.packet_queue.get()
+            if packet is None:
+                # Leave the end marker queued for every other iterator
+                self.queue_packet(None)
+                return
+            yield packet
+
+    async def round_trip(self, key, data: bytes, timeout: float):
+        self.start()
+        if self.closed or self.read_task.done():
+            # Nothing will answer, fail now instead of after the timeout
+            raise ConnectionError("Device disconnected") from self.read_error
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.setdefault(key, []).append(future)
+        try:
+            self.writer.write(data)
+            await self.writer.drain()
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            waiters = self.waiters.get(key)
+            if waiters and future in waiters:
+                waiters.remove(future)
+                if not waiters:
+                    del self.waiters[key]
+
+    async def request(self, packet_id: PacketID, timeout: float = ASYNC_TIMEOUT):
+        """Requests a packet and returns it decoded once the device responds.
+        Raises asyncio.TimeoutError if it does not respond within timeout and
+        ConnectionError if the device disconnects first."""
+        return await self.round_trip(
+            int(packet_id), RequestPacket(packet_id).encode_bytes(), timeout
+        )
+
+    async def send(self, packet, timeout: float = ASYNC_TIMEOUT):
+        """Sends a packet, such as a configuration packet, and returns the
+        AcknowledgePacket the device responds with. Raises
+        asyncio.TimeoutError if it is not acknowledged within timeout and
+        ConnectionError if the device disconnects first."""
+        return await self.round_trip(
+            (int(PacketID.acknowledge), int(packet.ID)),
+            packet.encode().bytes(),
+            timeout,
+        )
@@ -28,6 +28,8 @@
 ################################################################################
 
 import os
+import queue
+import threading
 import serial
 import serial.serialutil as serialutil
 from abc import ABC, abstractmethod
@@ -35,12 +37,26 @@ from abc import ABC, abstractmethod
 from anpp_packets.an_packets import PacketID
 from anpp_packets.an_packet_protocol import ANDecoder
 from anpp_packets.an_packet_1 import RequestPacket
+from anpp_packets.an_packet_dispatch import dispatcher_for_class
+
+READER_QUEUE_SIZE = 1024  # Packets held for the caller before the oldest is dropped
+READER_TIMEOUT = 0.1      # Seconds a reader thread read blocks before checking for stop
+
+_READER_STOPPED = object()  # Queued when the reader thread stops on an error
 
 
 class AdvancedNavigationDeviceSerial(ABC):
-    def __init__(self, port, baud):
-        self.decoder = ANDecoder()
+    def __init__(self, port, baud, decoder_capacity=0, decoder_zero_copy=False):
+        self.decoder = ANDecoder(decoder_capacity, decoder_zero_copy)
+        self.dispatcher = dispatcher_for_class(type(self))
         self.ser = None
+        self.reader_thread = None
+        self.reader_stop = threading.Event()
+        self.packet_queue = None
+        self.dropped_packets = 0
+        self.decode_errors = 0
+        self.reader_error = None
+        self.raw_sink_error = None
 
         if isinstance(port, str):
             self.port = port
@@ -85,6 +101,7 @@ class AdvancedNavigationDeviceSerial(ABC):
             exit()
 
     def close(self):
+        self.stop_reader()
         self.ser.close()
 
     def is_open(self):
@@ -99,6 +116,149 @@ class AdvancedNavigationDeviceSerial(ABC):
     def read(self, bytes_in_buffer):
         return self.ser.read(bytes_in_buffer)
 
+    def read_into_decoder(self):
+        """Reads all waiting bytes into the decoder buffer and returns the
+        number of bytes read"""
+        return self.decoder.add_data_from(self.ser, self.in_waiting())
+
+    def decode_typed(self, an_packet):
+        """Decodes an ANPacket into the packet class this device uses for its
+        packet ID and length. Returns None if the packet is unknown to the
+        device or fails to decode."""
+        return self.dispatcher.decode(an_packet)
+
+    # Background Reader
+    def start_reader(
+        self,
+        queue_size=READER_QUEUE_SIZE,
+        timeout=READER_TIMEOUT,
+        typed=True,
+        raw_sink=None,
+    ):
+        """Starts a thread that blocks on the serial port, decodes the received
+        packets and puts them into a bounded queue, read with get_packet or
+        iter_packets. With typed set packets are decoded to their packet class
+        with decode_typed in the thread, otherwise the ANPackets are queued.
+        When the queue is full the oldest packet is dropped and counted in
+        dropped_packets. A packet of a known ID that fails to decode, such as
+        one with a bad length, is skipped and counted in decode_errors.
+
+        With raw_sink, an object with a write method such as a
+        RawStreamRecorder, every chunk read is also passed to raw_sink.write
+        as a memoryview before it is decoded; the view is only valid during
+        the call. If raw_sink.write raises, recording stops, the error is kept
+        in raw_sink_error and decoding carries on.
+
+        If the thread stops on an error, get_packet and iter_packets raise
+        RuntimeError from reader_error once the packets queued before it are
+        consumed. Do not call read or read_into_decoder while the reader is
+        running, as the thread owns the decoder."""
+        if self.reader_thread is not None:
+            raise RuntimeError("Reader is already running")
+        if self.decoder.zero_copy and not typed:
+            raise ValueError("Zero copy packets can not be queued, use typed")
+
+        self.packet_queue = queue.Queue(queue_size)
+        self.reader_stop.clear()
+        self.reader_error = None
+        self.raw_sink_error = None
+        self.ser.timeout = timeout
+        self.reader_thread = threading.Thread(
+            target=self.reader_loop,
+            args=(typed, raw_sink),
+            name="anpp-reader",
+            daemon=True,
+        )
+        self.reader_thread.start()
+
+    def stop_reader(self):
+        """Stops the reader thread and waits for it to finish"""
+        if self.reader_thread is None:
+            return
+        self.reader_stop.set()
+        self.reader_thread.join()
+        self.reader_thread = None
+
+    def reader_loop(self, typed, raw_sink=None):
+        try:
+            while not self.reader_stop.is_set():
+                # Reads straight into the decoder buffer, returns as soon as
+                # any byte arrives, or 0 after timeout
+                count = self.decoder.add_data_from(
+                    self.ser, max(1, self.ser.in_waiting)
+                )
+                if not count:
+                    continue
+
+                if raw_sink is not None:
+                    # The sink gets a view of the bytes just read and copies it.
+                    # A failing sink is dropped so the live packets keep coming.
+                    end = self.decoder.buffer_end
+                    try:
+                        with memoryview(self.decoder.buffer) as view:
+                            with view[end - count : end] as data:
+                                raw_sink.write(data)
+                    except Exception as e:
+                        print(f"exception in raw sink, recording stopped : {e}")
+                        self.raw_sink_error = e
+                        raw_sink = None
+                for an_packet in self.decoder.decode_all():
+                    if typed:
+                        try:
+                            packet = self.decode_typed(an_packet)
+                        except Exception as e:
+                            print(f"exception decoding packet {an_packet.id} : {e}")
+                            self.decode_errors += 1
+                            continue
+                        if packet is None and self.dispatcher.is_known(an_packet.id):
+                            # A known packet with a bad length or field value
+                            self.decode_errors += 1
+                            continue
+                    else:
+                        packet = an_packet
+                    if packet is not None:
+                        self.queue_packet(packet)
+        except Exception as e:
+            print(f"exception in reader : {e}")
+            self.reader_error = e
+            self.queue_packet(_READER_STOPPED)
+
+    def queue_packet(self, packet):
+        """Queues a packet, dropping the oldest one while the queue is full"""
+        while True:
+            try:
+                self.packet_queue.put_nowait(packet)
+                return
+            except queue.Full:
+                try:
+                    self.packet_queue.get_nowait()
+                    self.dropped_packets += 1
+                except queue.Empty:
+                    pass
+
+    def get_packet(self, timeout=None):
+        """Returns the next packet queued by the reader thread, or None if no
+        packet arrives within timeout seconds. Raises RuntimeError once the
+        reader thread has stopped on an error."""
+        try:
+            packet = self.packet_queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if packet is _READER_STOPPED:
+            # Leave the marker queued so every later call raises as well
+            self.packet_queue.put_nowait(packet)
+            raise RuntimeError("Reader thread stopped") from self.reader_error
+        return packet
+
+    def iter_packets(self, timeout=None):
+        """Yields every packet queued by the reader thread, waiting up to
+        timeout seconds for the first one, so callers can do other work
+        between calls without spinning"""
+        packet = self.get_packet(timeout)
+        while packet is not None:
+            yield packet
+            packet = self.get_packet(0)
+
     # Device and Configuration Information
     @abstractmethod
     def return_device_information_and_configuration_packets(self):
@@ -116,4 +276,4 @@ class AdvancedNavigationDeviceSerial(ABC):
     # System Packets
     def request_packet(self, packet_id: PacketID):
         print(f"Requesting PacketIDs: {packet_id}")
-        self.ser.write(RequestPacket(packet_id).encode().bytes())
+        self.ser.write(RequestPacket(packet_id).encode_bytes())
@@ -33,6 +33,7 @@ from abc import ABC, abstractmethod
 from anpp_packets.an_packets import PacketID
 from anpp_packets.an_packet_protocol import ANDecoder
 from anpp_packets.an_packet_1 import RequestPacket
+from anpp_packets.an_packet_dispatch import dispatcher_for_class
 
 
 class AdvancedNavigationDeviceTCP(ABC):
@@ -41,6 +42,7 @@ class AdvancedNavigationDeviceTCP(ABC):
         self.address = None
         self.port = None
         self.decoder = ANDecoder()
+        self.dispatcher = dispatcher_for_class(type(self))
 
         if isinstance(address, str):
             self.address = address
@@ -85,6 +87,12 @@ class AdvancedNavigationDeviceTCP(ABC):
             print(f"exception in read : {e}")
             return None
 
+    def decode_typed(self, an_packet):
+        """Decodes an ANPacket into the packet class this device uses for its
+        packet ID and length. Returns None if the packet is unknown to the
+        device or fails to decode."""
+        return self.dispatcher.decode(an_packet)
+
     # Device and Configuration Information
     @abstractmethod
     def return_device_information_and_configuration_packets(self):
@@ -102,4 +110,4 @@ class AdvancedNavigationDeviceTCP(ABC):
     # System Packets
     def request_packet(self, packet_id: PacketID):
         print(f"Requesting PacketIDs: {packet_id}")
-        self.tcp.sendall(RequestPacket(packet_id).encode().bytes())
+        self.tcp.sendall(RequestPacket(packet_id).encode_bytes())
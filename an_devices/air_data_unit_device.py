@@ -31,22 +31,28 @@ from .advanced_navigation_device_serial import (
     AdvancedNavigationDeviceSerial as _AdvancedNavigationDevice,
 )
 from anpp_packets.an_packets import PacketID as _PacketID
+from anpp_packets.an_packet_dispatch import LazyPacketImports as _LazyPacketImports
 
-from anpp_packets.an_packet_0 import AcknowledgePacket, AcknowledgeResult
-from anpp_packets.an_packet_1 import RequestPacket
-from anpp_packets.an_packet_2 import BootModePacket, BootMode
-from anpp_packets.an_packet_3 import DeviceInformationPacket
-from anpp_packets.an_packet_4 import RestoreFactorySettingsPacket
-from anpp_packets.an_packet_5 import ResetPacket, ResetVerification
-from anpp_packets.an_packet_7 import (
-    FileTransferFirstPacket,
-    DataEncoding,
-    FileTransferMetadata,
+# Packet classes and enums are imported on first access, so a process only
+# imports the packet modules it uses
+_packets = _LazyPacketImports(
+    __name__,
+    {
+        0: ("AcknowledgePacket", "AcknowledgeResult"),
+        1: ("RequestPacket",),
+        2: ("BootModePacket", "BootMode"),
+        3: ("DeviceInformationPacket",),
+        4: ("RestoreFactorySettingsPacket",),
+        5: ("ResetPacket", "ResetVerification"),
+        7: ("FileTransferFirstPacket", "DataEncoding", "FileTransferMetadata"),
+        8: ("FileTransferAcknowledgePacket", "FileTransferResponse"),
+        9: ("FileTransferOngoingPacket",),
+        28: ("RawSensorsPacketAdu as RawSensorsPacket",),
+        68: ("AirDataPacket",),
+    },
 )
-from anpp_packets.an_packet_8 import FileTransferAcknowledgePacket, FileTransferResponse
-from anpp_packets.an_packet_9 import FileTransferOngoingPacket
-from anpp_packets.an_packet_28 import RawSensorsPacketAdu as RawSensorsPacket
-from anpp_packets.an_packet_68 import AirDataPacket
+__getattr__ = _packets.resolve
+__dir__ = _packets.names
 
 
 class AirDataUnit(_AdvancedNavigationDevice):
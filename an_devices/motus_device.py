@@ -31,96 +31,92 @@ from .advanced_navigation_device_serial import (
     AdvancedNavigationDeviceSerial as _AdvancedNavigationDevice,
 )
 from anpp_packets.an_packets import PacketID as _PacketID
+from anpp_packets.an_packet_dispatch import LazyPacketImports as _LazyPacketImports
 
-from anpp_packets.an_packet_0 import AcknowledgePacket, AcknowledgeResult
-from anpp_packets.an_packet_1 import RequestPacket
-from anpp_packets.an_packet_2 import BootModePacket, BootMode
-from anpp_packets.an_packet_3 import DeviceInformationPacket
-from anpp_packets.an_packet_4 import RestoreFactorySettingsPacket
-from anpp_packets.an_packet_5 import ResetPacket, ResetVerification
-from anpp_packets.an_packet_7 import (
-    FileTransferFirstPacket,
-    DataEncoding,
-    FileTransferMetadata,
+# Packet classes and enums are imported on first access, so a process only
+# imports the packet modules it uses
+_packets = _LazyPacketImports(
+    __name__,
+    {
+        0: ("AcknowledgePacket", "AcknowledgeResult"),
+        1: ("RequestPacket",),
+        2: ("BootModePacket", "BootMode"),
+        3: ("DeviceInformationPacket",),
+        4: ("RestoreFactorySettingsPacket",),
+        5: ("ResetPacket", "ResetVerification"),
+        7: ("FileTransferFirstPacket", "DataEncoding", "FileTransferMetadata"),
+        8: ("FileTransferAcknowledgePacket", "FileTransferResponse"),
+        9: ("FileTransferOngoingPacket",),
+        10: ("SerialPortPassthroughPacket", "PassthroughRoute"),
+        20: ("SystemStatePacket", "GNSSFixType"),
+        21: ("UnixTimePacket",),
+        22: ("FormattedTimePacket",),
+        23: ("StatusPacket",),
+        24: ("PositionStandardDeviationPacket",),
+        25: ("VelocityStandardDeviationPacket",),
+        26: ("EulerOrientationStandardDeviationPacket",),
+        27: ("QuaternionOrientationStandardDeviationPacket",),
+        28: ("RawSensorsPacket",),
+        29: ("RawGNSSPacket",),
+        30: ("SatellitesPacket",),
+        31: ("DetailedSatellitesPacket", "SatelliteSystem"),
+        32: ("GeodeticPositionPacket",),
+        33: ("ECEFPositionPacket",),
+        34: ("UTMPositionPacket",),
+        35: ("NEDVelocityPacket",),
+        36: ("BodyVelocityPacket",),
+        37: ("AccelerationPacket",),
+        38: ("BodyAccelerationPacket",),
+        39: ("EulerOrientationPacket",),
+        40: ("QuaternionOrientationPacket",),
+        41: ("DCMOrientationPacket",),
+        42: ("AngularVelocityPacket",),
+        43: ("AngularAccelerationPacket",),
+        44: ("ExternalPositionVelocityPacket",),
+        45: ("ExternalPositionPacket",),
+        46: ("ExternalVelocityPacket",),
+        47: ("ExternalBodyVelocityPacket",),
+        48: ("ExternalHeadingPacket",),
+        49: ("RunningTimePacket",),
+        50: ("LocalMagneticFieldPacket",),
+        51: ("OdometerStatePacket",),
+        52: ("ExternalTimePacket",),
+        53: ("ExternalDepthPacket",),
+        54: ("GeoidHeightPacket",),
+        55: ("RTCMCorrectionsPacket",),
+        57: ("WindPacket",),
+        58: ("HeavePacket",),
+        67: ("ExternalOdometerPacket",),
+        68: ("ExternalAirDataPacket",),
+        72: ("GimbalStatePacket",),
+        73: ("AutomotivePacket",),
+        83: ("ZeroAngularVelocityPacket",),
+        180: ("PacketTimerPeriodPacket",),
+        181: ("PacketsPeriodPacket",),
+        182: ("BaudRatesPacket",),
+        185: ("InstallationAlignmentPacket",),
+        186: ("FilterOptionsPacket", "VehicleType"),
+        188: (
+            "GPIOConfigurationPacket",
+            "GPIO1Function",
+            "GPIO2Function",
+            "AuxiliaryTxFunction",
+            "AuxiliaryRxFunction",
+            "GPIOIndex",
+        ),
+        189: ("MagneticCalibrationValuesPacket",),
+        190: ("MagneticCalibrationConfigurationPacket", "MagneticCalibrationAction"),
+        191: ("MagneticCalibrationStatusPacket", "MagneticCalibrationStatus"),
+        192: ("OdometerConfigurationPacket",),
+        193: ("SetZeroOrientationAlignmentPacket",),
+        194: ("ReferencePointOffsetsPacket",),
+        195: ("GPIOOutputConfigurationPacket", "GPIORate", "NMEAFixBehaviour"),
+        198: ("UserDataPacket",),
+        199: ("GPIOInputConfigurationPacket",),
+    },
 )
-from anpp_packets.an_packet_8 import FileTransferAcknowledgePacket, FileTransferResponse
-from anpp_packets.an_packet_9 import FileTransferOngoingPacket
-from anpp_packets.an_packet_10 import SerialPortPassthroughPacket, PassthroughRoute
-from anpp_packets.an_packet_20 import SystemStatePacket, GNSSFixType
-from anpp_packets.an_packet_21 import UnixTimePacket
-from anpp_packets.an_packet_22 import FormattedTimePacket
-from anpp_packets.an_packet_23 import StatusPacket
-from anpp_packets.an_packet_24 import PositionStandardDeviationPacket
-from anpp_packets.an_packet_25 import VelocityStandardDeviationPacket
-from anpp_packets.an_packet_26 import EulerOrientationStandardDeviationPacket
-from anpp_packets.an_packet_27 import QuaternionOrientationStandardDeviationPacket
-from anpp_packets.an_packet_28 import RawSensorsPacket
-from anpp_packets.an_packet_29 import RawGNSSPacket
-from anpp_packets.an_packet_30 import SatellitesPacket
-from anpp_packets.an_packet_31 import DetailedSatellitesPacket, SatelliteSystem
-from anpp_packets.an_packet_32 import GeodeticPositionPacket
-from anpp_packets.an_packet_33 import ECEFPositionPacket
-from anpp_packets.an_packet_34 import UTMPositionPacket
-from anpp_packets.an_packet_35 import NEDVelocityPacket
-from anpp_packets.an_packet_36 import BodyVelocityPacket
-from anpp_packets.an_packet_37 import AccelerationPacket
-from anpp_packets.an_packet_38 import BodyAccelerationPacket
-from anpp_packets.an_packet_39 import EulerOrientationPacket
-from anpp_packets.an_packet_40 import QuaternionOrientationPacket
-from anpp_packets.an_packet_41 import DCMOrientationPacket
-from anpp_packets.an_packet_42 import AngularVelocityPacket
-from anpp_packets.an_packet_43 import AngularAccelerationPacket
-from anpp_packets.an_packet_44 import ExternalPositionVelocityPacket
-from anpp_packets.an_packet_45 import ExternalPositionPacket
-from anpp_packets.an_packet_46 import ExternalVelocityPacket
-from anpp_packets.an_packet_47 import ExternalBodyVelocityPacket
-from anpp_packets.an_packet_48 import ExternalHeadingPacket
-from anpp_packets.an_packet_49 import RunningTimePacket
-from anpp_packets.an_packet_50 import LocalMagneticFieldPacket
-from anpp_packets.an_packet_51 import OdometerStatePacket
-from anpp_packets.an_packet_52 import ExternalTimePacket
-from anpp_packets.an_packet_53 import ExternalDepthPacket
-from anpp_packets.an_packet_54 import GeoidHeightPacket
-from anpp_packets.an_packet_55 import RTCMCorrectionsPacket
-from anpp_packets.an_packet_57 import WindPacket
-from anpp_packets.an_packet_58 import HeavePacket
-from anpp_packets.an_packet_67 import ExternalOdometerPacket
-from anpp_packets.an_packet_68 import ExternalAirDataPacket
-from anpp_packets.an_packet_72 import GimbalStatePacket
-from anpp_packets.an_packet_73 import AutomotivePacket
-from anpp_packets.an_packet_83 import ZeroAngularVelocityPacket
-from anpp_packets.an_packet_180 import PacketTimerPeriodPacket
-from anpp_packets.an_packet_181 import PacketsPeriodPacket
-from anpp_packets.an_packet_182 import BaudRatesPacket
-from anpp_packets.an_packet_185 import InstallationAlignmentPacket
-from anpp_packets.an_packet_186 import FilterOptionsPacket, VehicleType
-from anpp_packets.an_packet_188 import (
-    GPIOConfigurationPacket,
-    GPIO1Function,
-    GPIO2Function,
-    AuxiliaryTxFunction,
-    AuxiliaryRxFunction,
-    GPIOIndex,
-)
-from anpp_packets.an_packet_189 import MagneticCalibrationValuesPacket
-from anpp_packets.an_packet_190 import (
-    MagneticCalibrationConfigurationPacket,
-    MagneticCalibrationAction,
-)
-from anpp_packets.an_packet_191 import (
-    MagneticCalibrationStatusPacket,
-    MagneticCalibrationStatus,
-)
-from anpp_packets.an_packet_192 import OdometerConfigurationPacket
-from anpp_packets.an_packet_193 import SetZeroOrientationAlignmentPacket
-from anpp_packets.an_packet_194 import ReferencePointOffsetsPacket
-from anpp_packets.an_packet_195 import (
-    GPIOOutputConfigurationPacket,
-    GPIORate,
-    NMEAFixBehaviour,
-)
-from anpp_packets.an_packet_198 import UserDataPacket
-from anpp_packets.an_packet_199 import GPIOInputConfigurationPacket
+__getattr__ = _packets.resolve
+__dir__ = _packets.names
 
 
 class Motus(_AdvancedNavigationDevice):
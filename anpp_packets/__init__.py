@@ -1,5 +1,8 @@
+# an_packet_arrays, an_packet_observations and an_packet_ephemeris need NumPy,
+# import them explicitly
 __all__ = ['an_packet_protocol',
            'an_packets',
+           'an_packet_dispatch',
            'an_packet_0',
            'an_packet_1',
            'an_packet_2',
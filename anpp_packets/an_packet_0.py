@@ -45,7 +45,7 @@ class AcknowledgeResult(Enum):
     failure_unknown_packet = 6
 
 
-@dataclass()
+@dataclass(slots=True)
 class AcknowledgePacket:
     """Packet 0 - Acknowledge Packet"""
 
@@ -32,11 +32,11 @@ import struct
 
 from typing import List
 
-from anpp_packets.an_packet_protocol import ANPacket
+from anpp_packets.an_packet_protocol import ANPacket, encode_packet_bytes
 from anpp_packets.an_packets import PacketID
 
 
-@dataclass()
+@dataclass(slots=True)
 class RequestPacket:
     """Packet 1 - Request Packet"""
 
@@ -45,17 +45,30 @@ class RequestPacket:
     ID = PacketID.request
 
     _structure = struct.Struct("<B")
-    def encode(self) -> ANPacket:
-        """Encode Request Packet to ANPacket
-        Returns the ANPacket"""
+
+    def pack(self) -> bytearray:
+        """Pack the requested packet IDs into the packet data"""
         if not isinstance(self.requested_packets, list):
             self.requested_packets = [self.requested_packets]
 
-        data = bytes()
-        for packet in self.requested_packets:
-            data += self._structure.pack(PacketID(packet).value)
+        data = bytearray(self._structure.size * len(self.requested_packets))
+        for i, packet in enumerate(self.requested_packets):
+            self._structure.pack_into(
+                data, i * self._structure.size, PacketID(packet).value
+            )
+        return data
+
+    def encode(self) -> ANPacket:
+        """Encode Request Packet to ANPacket
+        Returns the ANPacket"""
+        data = self.pack()
 
         an_packet = ANPacket()
         an_packet.encode(self.ID, len(data), data)
 
         return an_packet
+
+    def encode_bytes(self) -> bytes:
+        """Encode Request Packet to bytes, reusing the cached encoding when the
+        same packets were requested before"""
+        return encode_packet_bytes(self.ID, bytes(self.pack()))
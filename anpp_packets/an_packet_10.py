@@ -42,7 +42,7 @@ class PassthroughRoute(Enum):
     auxiliary = 1
 
 
-@dataclass()
+@dataclass(slots=True)
 class SerialPortPassthroughPacket:
     """Packet 10 - Serial Port Passthrough Packet"""
 
@@ -66,8 +66,9 @@ class SerialPortPassthroughPacket:
     def encode(self) -> ANPacket:
         """Encode Serial Port Passthrough Packet to ANPacket
         Returns the ANPacket"""
-        data = self._structure.pack(self.passthrough_route.value)
-        data += self.passthrough_data
+        data = bytearray(self._structure.size + len(self.passthrough_data))
+        self._structure.pack_into(data, 0, self.passthrough_route.value)
+        data[self._structure.size :] = self.passthrough_data
 
         an_packet = ANPacket()
         an_packet.encode(self.ID, len(data), data)
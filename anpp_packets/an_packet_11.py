@@ -45,7 +45,7 @@ class LinkMode(Enum):
     half_duplex_10mb = 4
 
 
-@dataclass()
+@dataclass(slots=True)
 class DHCPMode:
     """DHCP Mode"""
 
@@ -66,7 +66,7 @@ class DHCPMode:
         )
 
 
-@dataclass()
+@dataclass(slots=True)
 class IPConfigurationPacket:
     """Packet 11 - IP Configuration Packet"""
 
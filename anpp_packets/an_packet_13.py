@@ -45,7 +45,7 @@ class CertusDeviceSubtype(Enum):
     certus_evo_oem = 3
 
 
-@dataclass()
+@dataclass(slots=True)
 class ExtendedDeviceInformationPacket:
     """Packet 13 - Extended Device Information Packet"""
 
@@ -35,7 +35,7 @@ from anpp_packets.an_packet_protocol import ANPacket
 from anpp_packets.an_packet_3 import DeviceID
 
 
-@dataclass()
+@dataclass(slots=True)
 class SubcomponentInformation:
     """Subcomponent Information"""
 
@@ -58,7 +58,7 @@ class SubcomponentInformation:
         self.device_id = DeviceID(device_id_value)
 
 
-@dataclass()
+@dataclass(slots=True)
 class SubcomponentInformationPacket:
     """Packet 14 - Subcomponent Information Packet"""
 
@@ -31,10 +31,10 @@ from dataclasses import dataclass, field
 import struct
 from typing import List
 from anpp_packets.an_packets import PacketID
-from anpp_packets.an_packet_protocol import ANPacket
+from anpp_packets.an_packet_protocol import ANPacket, encode_packet_bytes
 
 
-@dataclass()
+@dataclass(slots=True)
 class PacketPeriod:
     """Packet Period"""
 
@@ -45,18 +45,21 @@ class PacketPeriod:
 
     _structure = struct.Struct("<BI")
 
-    def unpack(self, data):
-        """Unpack data bytes"""
+    def unpack(self, data, offset=0):
+        """Unpack data bytes starting at offset"""
         (
             self.packet_id,
             self.period,
-        ) = self._structure.unpack_from(data)
+        ) = self._structure.unpack_from(data, offset)
 
     def pack(self):
         return self._structure.pack(self.packet_id, self.period)
 
+    def pack_into(self, buffer, offset):
+        self._structure.pack_into(buffer, offset, self.packet_id, self.period)
 
-@dataclass()
+
+@dataclass(slots=True)
 class PacketsPeriodPacket:
     """Packet 181 - Packets Period Packet"""
 
@@ -78,31 +81,38 @@ class PacketsPeriodPacket:
             or (len(an_packet.data) - self.MINIMUM_LENGTH) % PacketPeriod.LENGTH != 0
         ):
             return 1
-        packet_periods_count = int(
-            (an_packet.length - self.MINIMUM_LENGTH) / PacketPeriod.LENGTH
-        )
         self.permanent = an_packet.data[0]
         self.clear_existing_packets = an_packet.data[1]
-        self.packet_periods = [PacketPeriod()] * packet_periods_count
-        for i in range(packet_periods_count):
-            index = self.MINIMUM_LENGTH + i * PacketPeriod.LENGTH
-            self.packet_periods[i].unpack(
-                an_packet.data[index : index + PacketPeriod.LENGTH]
-            )
+        self.packet_periods = []
+        for index in range(
+            self.MINIMUM_LENGTH, len(an_packet.data), PacketPeriod.LENGTH
+        ):
+            packet_period = PacketPeriod()
+            packet_period.unpack(an_packet.data, index)
+            self.packet_periods.append(packet_period)
         return 0
 
+    def pack(self) -> bytearray:
+        """Pack the packet periods into the packet data"""
+        data = bytearray(
+            self.MINIMUM_LENGTH + PacketPeriod.LENGTH * len(self.packet_periods)
+        )
+        self._structure.pack_into(data, 0, self.permanent, self.clear_existing_packets)
+        for i, packet_period in enumerate(self.packet_periods):
+            packet_period.pack_into(data, self.MINIMUM_LENGTH + i * PacketPeriod.LENGTH)
+        return data
+
     def encode(self) -> ANPacket:
         """Encode Packets Period Packet to ANPacket
         Returns the ANPacket"""
-        data = self._structure.pack(self.permanent, self.clear_existing_packets)
-        for i in range(len(self.packet_periods)):
-            data += self.packet_periods[i].pack()
+        data = self.pack()
 
         an_packet = ANPacket()
-        an_packet.encode(
-            self.ID,
-            (self.MINIMUM_LENGTH + PacketPeriod.LENGTH * len(self.packet_periods)),
-            data,
-        )
+        an_packet.encode(self.ID, len(data), data)
 
         return an_packet
+
+    def encode_bytes(self) -> bytes:
+        """Encode Packets Period Packet to bytes, reusing the cached encoding
+        when the same configuration was sent before"""
+        return encode_packet_bytes(self.ID, bytes(self.pack()))
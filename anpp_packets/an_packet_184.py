@@ -58,7 +58,7 @@ class MagnetometerRange(Enum):
     magnetometer_range_8g = 2
 
 
-@dataclass()
+@dataclass(slots=True)
 class SensorRangesPacket:
     """Packet 184 - Sensor Ranges Packet"""
 
@@ -53,7 +53,7 @@ class VehicleType(Enum):
     race_car = 13
 
 
-@dataclass()
+@dataclass(slots=True)
 class FilterOptionsPacket:
     """Packet 186 - Filter Options Packet"""
 
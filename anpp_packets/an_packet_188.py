@@ -196,7 +196,7 @@ class GPIOVoltage(Enum):
     power_disabled = 2
 
 
-@dataclass()
+@dataclass(slots=True)
 class GPIOConfigurationPacket:
     """Packet 188 - GPIO Configuration Packet"""
 
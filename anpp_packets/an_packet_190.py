@@ -43,7 +43,7 @@ class MagneticCalibrationAction(Enum):
     reset = 4
 
 
-@dataclass()
+@dataclass(slots=True)
 class MagneticCalibrationConfigurationPacket:
     """Packet 190 - Magnetic Calibration Configuration Packet"""
 
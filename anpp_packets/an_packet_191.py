@@ -51,7 +51,7 @@ class MagneticCalibrationStatus(Enum):
     error_interference = 12
 
 
-@dataclass()
+@dataclass(slots=True)
 class MagneticCalibrationStatusPacket:
     """Packet 191 - Magnetic Calibration Status Packet"""
 
@@ -80,7 +80,7 @@ class NMEAFixBehaviour(Enum):
     nmea_fix_behaviour_always_3d = 1
 
 
-@dataclass()
+@dataclass(slots=True)
 class GPIOPort:
     port_input_mode: PortInputMode = PortInputMode.inactive
     port_output_mode: PortOutputMode = PortOutputMode.inactive
@@ -151,7 +151,7 @@ class GPIOPort:
         return data
 
 
-@dataclass()
+@dataclass(slots=True)
 class GPIOOutputConfigurationPacket:
     """Packet 195 - GPIO Output Configuration Packet"""
 
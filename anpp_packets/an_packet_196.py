@@ -50,7 +50,7 @@ class AutomaticOffsetOrientation(Enum):
     primary_left_secondary_right = 3
 
 
-@dataclass()
+@dataclass(slots=True)
 class DualAntennaConfigurationPacket:
     """Packet 196 - Dual Antenna Configuration Packet"""
 
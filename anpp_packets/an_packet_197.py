@@ -73,7 +73,7 @@ class LBandSatelliteID(Enum):
     auto = 110
 
 
-@dataclass()
+@dataclass(slots=True)
 class GNSSFrequencies:
     """GNSS Frequencies"""
 
@@ -181,7 +181,7 @@ class GNSSFrequencies:
         )
 
 
-@dataclass()
+@dataclass(slots=True)
 class GNSSConfigurationPacket:
     """Packet 197 - GNSS Configuration Packet"""
 
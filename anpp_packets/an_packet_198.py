@@ -34,7 +34,7 @@ from anpp_packets.an_packets import PacketID
 from anpp_packets.an_packet_protocol import ANPacket
 
 
-@dataclass()
+@dataclass(slots=True)
 class UserDataPacket:
     """Packet 198 - User Data Packet"""
 
@@ -47,7 +47,7 @@ class UserDataPacket:
         """Decode ANPacket to User Data Packet
         Returns 0 on success and 1 on failure"""
         if (an_packet.id == self.ID) and (len(an_packet.data) == self.LENGTH):
-            self.user_data = an_packet.data[0 : self.LENGTH]
+            self.user_data = bytes(an_packet.data[0 : self.LENGTH])
             return 0
         else:
             return 1
@@ -41,7 +41,7 @@ class BootMode(Enum):
     main_program = 1
 
 
-@dataclass()
+@dataclass(slots=True)
 class BootModePacket:
     """Packet 2 - Boot Mode Packet"""
 
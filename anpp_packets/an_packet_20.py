@@ -32,7 +32,7 @@ from enum import Enum
 from typing import List
 import struct
 from anpp_packets.an_packets import PacketID
-from anpp_packets.an_packet_protocol import ANPacket
+from anpp_packets.an_packet_protocol import ANPacket, BitField, FlagWord
 
 
 class GNSSFixType(Enum):
@@ -48,85 +48,61 @@ class GNSSFixType(Enum):
     rtk_fixed = 7
 
 
-@dataclass()
-class SystemStatus:
+@dataclass(slots=True, init=False)
+class SystemStatus(FlagWord):
     """System Status"""
 
-    system_failure: bool = False
-    accelerometer_sensor_failure: bool = False
-    gyroscope_sensor_failure: bool = False
-    magnetometer_sensor_failure: bool = False
-    pressure_sensor_failure: bool = False
-    gnss_failure: bool = False
-    accelerometer_over_range: bool = False
-    gyroscope_over_range: bool = False
-    magnetometer_over_range: bool = False
-    pressure_over_range: bool = False
-    minimum_temperature_alarm: bool = False
-    maximum_temperature_alarm: bool = False
-    low_voltage_alarm: bool = False
-    high_voltage_alarm: bool = False
-    gnss_antenna_disconnected: bool = False
-    data_output_overflow_alarm: bool = False
+    value: int = 0
+
+    system_failure = BitField(0)
+    accelerometer_sensor_failure = BitField(1)
+    gyroscope_sensor_failure = BitField(2)
+    magnetometer_sensor_failure = BitField(3)
+    pressure_sensor_failure = BitField(4)
+    gnss_failure = BitField(5)
+    accelerometer_over_range = BitField(6)
+    gyroscope_over_range = BitField(7)
+    magnetometer_over_range = BitField(8)
+    pressure_over_range = BitField(9)
+    minimum_temperature_alarm = BitField(10)
+    maximum_temperature_alarm = BitField(11)
+    low_voltage_alarm = BitField(12)
+    high_voltage_alarm = BitField(13)
+    gnss_antenna_disconnected = BitField(14)
+    data_output_overflow_alarm = BitField(15)
 
     def unpack(self, data):
         """Unpack data bytes"""
-        self.system_failure = (data & (1 << 0)) != 0
-        self.accelerometer_sensor_failure = (data & (1 << 1)) != 0
-        self.gyroscope_sensor_failure = (data & (1 << 2)) != 0
-        self.magnetometer_sensor_failure = (data & (1 << 3)) != 0
-        self.pressure_sensor_failure = (data & (1 << 4)) != 0
-        self.gnss_failure = (data & (1 << 5)) != 0
-        self.accelerometer_over_range = (data & (1 << 6)) != 0
-        self.gyroscope_over_range = (data & (1 << 7)) != 0
-        self.magnetometer_over_range = (data & (1 << 8)) != 0
-        self.pressure_over_range = (data & (1 << 9)) != 0
-        self.minimum_temperature_alarm = (data & (1 << 10)) != 0
-        self.maximum_temperature_alarm = (data & (1 << 11)) != 0
-        self.low_voltage_alarm = (data & (1 << 12)) != 0
-        self.high_voltage_alarm = (data & (1 << 13)) != 0
-        self.gnss_antenna_disconnected = (data & (1 << 14)) != 0
-        self.data_output_overflow_alarm = (data & (1 << 15)) != 0
-
-
-@dataclass()
-class FilterStatus:
+        self.value = data
+
+
+@dataclass(slots=True, init=False)
+class FilterStatus(FlagWord):
     """Filter Status"""
 
-    orientation_filter_initialised: bool = False
-    ins_filter_initialised: bool = False
-    heading_initialised: bool = False
-    utc_time_initialised: bool = False
-    gnss_fix_type: GNSSFixType = GNSSFixType.none
-    event1_flag: bool = False
-    event2_flag: bool = False
-    internal_gnss_enabled: bool = False
-    magnetic_heading_enabled: bool = False
-    velocity_heading_enabled: bool = False
-    atmospheric_altitude_enabled: bool = False
-    external_position_active: bool = False
-    external_velocity_active: bool = False
-    external_heading_active: bool = False
+    value: int = 0
+
+    orientation_filter_initialised = BitField(0)
+    ins_filter_initialised = BitField(1)
+    heading_initialised = BitField(2)
+    utc_time_initialised = BitField(3)
+    gnss_fix_type = BitField(4, 3, GNSSFixType)
+    event1_flag = BitField(7)
+    event2_flag = BitField(8)
+    internal_gnss_enabled = BitField(9)
+    magnetic_heading_enabled = BitField(10)
+    velocity_heading_enabled = BitField(11)
+    atmospheric_altitude_enabled = BitField(12)
+    external_position_active = BitField(13)
+    external_velocity_active = BitField(14)
+    external_heading_active = BitField(15)
 
     def unpack(self, data):
         """Unpack data bytes"""
-        self.orientation_filter_initialised = (data & (1 << 0)) != 0
-        self.ins_filter_initialised = (data & (1 << 1)) != 0
-        self.heading_initialised = (data & (1 << 2)) != 0
-        self.utc_time_initialised = (data & (1 << 3)) != 0
-        self.gnss_fix_type = GNSSFixType((data & 0x0070) >> 4)
-        self.event1_flag = (data & (1 << 7)) != 0
-        self.event2_flag = (data & (1 << 8)) != 0
-        self.internal_gnss_enabled = (data & (1 << 9)) != 0
-        self.magnetic_heading_enabled = (data & (1 << 10)) != 0
-        self.velocity_heading_enabled = (data & (1 << 11)) != 0
-        self.atmospheric_altitude_enabled = (data & (1 << 12)) != 0
-        self.external_position_active = (data & (1 << 13)) != 0
-        self.external_velocity_active = (data & (1 << 14)) != 0
-        self.external_heading_active = (data & (1 << 15)) != 0
-
-
-@dataclass()
+        self.value = data
+
+
+@dataclass(slots=True)
 class SystemStatePacket:
     """Packet 20 - System State Packet"""
 
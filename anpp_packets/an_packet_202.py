@@ -43,7 +43,7 @@ class IPDataportMode(Enum):
     udp = 4
 
 
-@dataclass()
+@dataclass(slots=True)
 class IPDataportConfiguration:
     """IP Dataport Configuration"""
 
@@ -64,12 +64,12 @@ class IPDataportConfiguration:
         return self._structure.pack(self.ip_address, self.port, self.mode.value)
 
 
-@dataclass()
+@dataclass(slots=True)
 class IPDataportConfigurationPacket:
     """Packet 202 - IP Dataport Configuration Packet"""
 
     ip_dataport_configuration: list[IPDataportConfiguration] = field(
-        default_factory=lambda: [IPDataportConfiguration()] * 4
+        default_factory=lambda: [IPDataportConfiguration() for _ in range(4)]
     )
 
     ID = PacketID.ip_dataports_configuration
@@ -40,7 +40,7 @@ class CANProtocol(Enum):
     CANopen = 0
 
 
-@dataclass()
+@dataclass(slots=True)
 class CANConfigurationPacket:
     """Packet 203 - CAN Configuration Packet"""
 
@@ -34,7 +34,7 @@ from anpp_packets.an_packet_protocol import ANPacket
 from anpp_packets.an_packet_20 import SystemStatus, FilterStatus
 
 
-@dataclass()
+@dataclass(slots=True)
 class StatusPacket:
     """Packet 23 - Status Packet"""
 
@@ -34,7 +34,7 @@ from anpp_packets.an_packets import PacketID
 from anpp_packets.an_packet_protocol import ANPacket
 
 
-@dataclass()
+@dataclass(slots=True)
 class VelocityStandardDeviationPacket:
     """Packet 25 - Velocity Standard Deviation Packet"""
 
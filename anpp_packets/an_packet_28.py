@@ -31,10 +31,10 @@ from dataclasses import dataclass, field
 import struct
 from typing import List
 from anpp_packets.an_packets import PacketID
-from anpp_packets.an_packet_protocol import ANPacket
+from anpp_packets.an_packet_protocol import ANPacket, BitField, FlagWord
 
 
-@dataclass()
+@dataclass(slots=True)
 class RawSensorsPacket:
     """Packet 28 - Raw Sensors Packet"""
 
@@ -67,32 +67,27 @@ class RawSensorsPacket:
             return 1
 
 
-@dataclass()
-class RawSensorStatusAdu:
+@dataclass(slots=True, init=False)
+class RawSensorStatusAdu(FlagWord):
     """Raw Sensor Status (ADU)"""
 
-    absolute_pressure_valid: bool = False
-    differential_pressure_valid: bool = False
-    absolute_pressure_sensor_overrange: bool = False
-    differential_pressure_sensor_overrange: bool = False
-    absolute_pressure_sensor_failure: bool = False
-    differential_pressure_sensor_failure: bool = False
-    temperature_sensor_valid: bool = False
-    temperature_sensor_failure: bool = False
+    value: int = 0
+
+    absolute_pressure_valid = BitField(0)
+    differential_pressure_valid = BitField(1)
+    absolute_pressure_sensor_overrange = BitField(2)
+    differential_pressure_sensor_overrange = BitField(3)
+    absolute_pressure_sensor_failure = BitField(4)
+    differential_pressure_sensor_failure = BitField(5)
+    temperature_sensor_valid = BitField(6)
+    temperature_sensor_failure = BitField(7)
 
     def unpack(self, data):
         """Unpack data bytes"""
-        self.absolute_pressure_valid = (data & (1 << 0)) != 0
-        self.differential_pressure_valid = (data & (1 << 1)) != 0
-        self.absolute_pressure_sensor_overrange = (data & (1 << 2)) != 0
-        self.differential_pressure_sensor_overrange = (data & (1 << 3)) != 0
-        self.absolute_pressure_sensor_failure = (data & (1 << 4)) != 0
-        self.differential_pressure_sensor_failure = (data & (1 << 5)) != 0
-        self.temperature_sensor_valid = (data & (1 << 6)) != 0
-        self.temperature_sensor_failure = (data & (1 << 7)) != 0
+        self.value = data
 
 
-@dataclass()
+@dataclass(slots=True)
 class RawSensorsPacketAdu:
     """Packet 28 - Raw Sensors Packet (ADU)"""
 
@@ -31,64 +31,41 @@ from dataclasses import dataclass, field
 import struct
 from typing import List
 from anpp_packets.an_packets import PacketID
-from anpp_packets.an_packet_protocol import ANPacket
+from anpp_packets.an_packet_protocol import ANPacket, BitField, FlagWord, defined_bits
 
 
-@dataclass()
-class RawGNSSFlags:
+@dataclass(slots=True, init=False)
+class RawGNSSFlags(FlagWord):
     """Raw GNSS Flags"""
 
-    fix_type: int = 0
-    doppler_velocity_valid: bool = False
-    time_valid: bool = False
-    external_gnss: bool = False
-    tilt_valid: bool = False
+    value: int = 0
+
+    fix_type = BitField(0, 3, int)
+    doppler_velocity_valid = BitField(3)
+    time_valid = BitField(4)
+    external_gnss = BitField(5)
+    tilt_valid = BitField(6)
     """Only valid if an external dual antenna GNSS system is connected"""
-    heading_valid: bool = False
+    heading_valid = BitField(7)
     """Only valid if an external dual antenna GNSS system is connected"""
-    floating_ambiguity_heading: bool = False
-    antenna_1_disconnected: bool = False
-    antenna_2_disconnected: bool = False
-    antenna_1_short: bool = False
-    antenna_2_short: bool = False
-    gnns_1_failure: bool = False
-    gnns_2_failure: bool = False
+    floating_ambiguity_heading = BitField(8)
+    antenna_1_disconnected = BitField(10)
+    antenna_2_disconnected = BitField(11)
+    antenna_1_short = BitField(12)
+    antenna_2_short = BitField(13)
+    gnns_1_failure = BitField(14)
+    gnns_2_failure = BitField(15)
 
     def unpack(self, flags_byte):
         """Unpack data bytes"""
-        self.fix_type = flags_byte & 0x0007
-        self.doppler_velocity_valid = (flags_byte & (1 << 3)) != 0
-        self.time_valid = (flags_byte & (1 << 4)) != 0
-        self.external_gnss = (flags_byte & (1 << 5)) != 0
-        self.tilt_valid = (flags_byte & (1 << 6)) != 0
-        self.heading_valid = (flags_byte & (1 << 7)) != 0
-        self.floating_ambiguity_heading = (flags_byte & (1 << 8)) != 0
-        self.antenna_1_disconnected = (flags_byte & (1 << 10)) != 0
-        self.antenna_2_disconnected = (flags_byte & (1 << 11)) != 0
-        self.antenna_1_short = (flags_byte & (1 << 12)) != 0
-        self.antenna_2_short = (flags_byte & (1 << 13)) != 0
-        self.gnns_1_failure = (flags_byte & (1 << 14)) != 0
-        self.gnns_2_failure = (flags_byte & (1 << 15)) != 0
+        self.value = flags_byte
 
     def pack(self) -> int:
         """Pack the boolean flags into a single integer byte"""
-        flags_byte = self.fix_type & 0x0007
-        flags_byte |= int(self.doppler_velocity_valid) << 3
-        flags_byte |= int(self.time_valid) << 4
-        flags_byte |= int(self.external_gnss) << 5
-        flags_byte |= int(self.tilt_valid) << 6
-        flags_byte |= int(self.heading_valid) << 7
-        flags_byte |= int(self.floating_ambiguity_heading) << 8
-        flags_byte |= int(self.antenna_1_disconnected) << 10
-        flags_byte |= int(self.antenna_2_disconnected) << 11
-        flags_byte |= int(self.antenna_1_short) << 12
-        flags_byte |= int(self.antenna_2_short) << 13
-        flags_byte |= int(self.gnns_1_failure) << 14
-        flags_byte |= int(self.gnns_2_failure) << 15
-        return flags_byte
-
-
-@dataclass()
+        return self.value & defined_bits(type(self))
+
+
+@dataclass(slots=True)
 class RawGNSSPacket:
     """Packet 29 - Raw GNSS Packet"""
 
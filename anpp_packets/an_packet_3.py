@@ -55,7 +55,7 @@ class DeviceID(Enum):
     boreas_coil = 36
 
 
-@dataclass()
+@dataclass(slots=True)
 class DeviceInformationPacket:
     """Packet 3 - Device Information Packet"""
 
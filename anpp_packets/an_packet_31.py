@@ -32,7 +32,7 @@ from enum import Enum
 import struct
 from typing import List
 from anpp_packets.an_packets import PacketID
-from anpp_packets.an_packet_protocol import ANPacket
+from anpp_packets.an_packet_protocol import ANPacket, BitField, FlagWord
 
 
 class SatelliteSystem(Enum):
@@ -49,31 +49,26 @@ class SatelliteSystem(Enum):
     omnistar = 8
 
 
-@dataclass()
-class SatelliteFrequencies:
+@dataclass(slots=True, init=False)
+class SatelliteFrequencies(FlagWord):
     """Satellite Frequencies"""
 
-    l1_ca: bool = False
-    l1_c: bool = False
-    l1_p: bool = False
-    l1_m: bool = False
-    l2_c: bool = False
-    l2_p: bool = False
-    l2_m: bool = False
-    l5: bool = False
+    value: int = 0
+
+    l1_ca = BitField(0)
+    l1_c = BitField(1)
+    l1_p = BitField(2)
+    l1_m = BitField(3)
+    l2_c = BitField(4)
+    l2_p = BitField(5)
+    l2_m = BitField(6)
+    l5 = BitField(7)
 
     def unpack(self, data):
-        self.l1_ca = (data & (1 << 0)) != 0
-        self.l1_c = (data & (1 << 1)) != 0
-        self.l1_p = (data & (1 << 2)) != 0
-        self.l1_m = (data & (1 << 3)) != 0
-        self.l2_c = (data & (1 << 4)) != 0
-        self.l2_p = (data & (1 << 5)) != 0
-        self.l2_m = (data & (1 << 6)) != 0
-        self.l5 = (data & (1 << 7)) != 0
+        self.value = data
 
 
-@dataclass()
+@dataclass(slots=True)
 class DetailedSatellite:
     """Detailed Satellite"""
 
@@ -90,8 +85,8 @@ class DetailedSatellite:
 
     _structure = struct.Struct("<BBBBHB")
 
-    def unpack(self, data):
-        """Unpack data bytes"""
+    def unpack(self, data, offset=0):
+        """Unpack data bytes starting at offset"""
         (
             satellite_system_value,
             self.number,
@@ -99,13 +94,13 @@ class DetailedSatellite:
             self.elevation,
             self.azimuth,
             self.snr,
-        ) = self._structure.unpack_from(data)
+        ) = self._structure.unpack_from(data, offset)
 
         self.satellite_system = SatelliteSystem(satellite_system_value)
         self.frequencies.unpack(frequency_value)
 
 
-@dataclass()
+@dataclass(slots=True)
 class DetailedSatellitesPacket:
     """Packet 31 - Detailed Satellites Packet"""
 
@@ -120,13 +115,11 @@ class DetailedSatellitesPacket:
         if (an_packet.id == self.ID) and (
             (len(an_packet.data) % DetailedSatellite.LENGTH) == 0
         ):
-            number_of_satellites = int(len(an_packet.data) / DetailedSatellite.LENGTH)
-            self.satellites = [DetailedSatellite()] * number_of_satellites
-            for i in range(number_of_satellites):
-                index = i * DetailedSatellite.LENGTH
-                self.satellites[i].unpack(
-                    an_packet.data[index : index + DetailedSatellite.LENGTH]
-                )
+            self.satellites = []
+            for index in range(0, len(an_packet.data), DetailedSatellite.LENGTH):
+                satellite = DetailedSatellite()
+                satellite.unpack(an_packet.data, index)
+                self.satellites.append(satellite)
             return 0
         else:
             return 1
@@ -34,7 +34,7 @@ from anpp_packets.an_packets import PacketID
 from anpp_packets.an_packet_protocol import ANPacket
 
 
-@dataclass()
+@dataclass(slots=True)
 class QuaternionOrientationPacket:
     """Packet 40 - Quaternion Orientation Packet"""
 
@@ -41,7 +41,7 @@ class ResetVerification(Enum):
     cold_start = 0x9A5D38B7
 
 
-@dataclass()
+@dataclass(slots=True)
 class ResetPacket:
     """Packet 5 - Reset Packet"""
 
@@ -32,29 +32,26 @@ from enum import Enum
 from typing import List
 import struct
 from anpp_packets.an_packets import PacketID
-from anpp_packets.an_packet_protocol import ANPacket
+from anpp_packets.an_packet_protocol import ANPacket, BitField, FlagWord
 from anpp_packets.an_packet_31 import SatelliteSystem
 
 
-@dataclass()
-class TrackingStatus:
+@dataclass(slots=True, init=False)
+class TrackingStatus(FlagWord):
     """Tracking Status"""
 
-    carrier_phase_valid: bool = False
-    carrier_phase_cycle_slip_detected: bool = False
-    carrier_phase_half_cycle_ambiguity: bool = False
-    pseudo_range_valid: bool = False
-    doppler_valid: bool = False
-    snr_valid: bool = False
+    value: int = 0
+
+    carrier_phase_valid = BitField(0)
+    carrier_phase_cycle_slip_detected = BitField(1)
+    carrier_phase_half_cycle_ambiguity = BitField(2)
+    pseudo_range_valid = BitField(3)
+    doppler_valid = BitField(4)
+    snr_valid = BitField(5)
 
     def unpack(self, data):
         """Unpack data bytes"""
-        self.carrier_phase_valid = (data & (1 << 0)) != 0
-        self.carrier_phase_cycle_slip_detected = (data & (1 << 1)) != 0
-        self.carrier_phase_half_cycle_ambiguity = (data & (1 << 2)) != 0
-        self.pseudo_range_valid = (data & (1 << 3)) != 0
-        self.doppler_valid = (data & (1 << 4)) != 0
-        self.snr_valid = (data & (1 << 5)) != 0
+        self.value = data
 
 
 class GPSSatelliteFrequency(Enum):
@@ -124,7 +121,7 @@ class QZSSSatelliteFrequency(Enum):
     l5 = 8
 
 
-@dataclass()
+@dataclass(slots=True)
 class FrequencyInformation:
     """Frequency Information"""
 
@@ -139,8 +136,8 @@ class FrequencyInformation:
 
     _structure = struct.Struct("<BBddff")
 
-    def unpack(self, data):
-        """Unpack data bytes"""
+    def unpack(self, data, offset=0):
+        """Unpack data bytes starting at offset"""
         (
             self.satellite_frequency,
             tracking_status_value,
@@ -148,12 +145,12 @@ class FrequencyInformation:
             self.pseudo_range,
             self.doppler_frequency,
             self.snr,
-        ) = self._structure.unpack_from(data)
+        ) = self._structure.unpack_from(data, offset)
 
         self.tracking_status.unpack(tracking_status_value)
 
 
-@dataclass()
+@dataclass(slots=True)
 class SatelliteData:
     """Satellite Data"""
 
@@ -170,29 +167,27 @@ class SatelliteData:
 
     _structure = struct.Struct("<BBBHB")
 
-    def unpack(self, data):
-        """Unpack data bytes"""
+    def unpack(self, data, offset=0):
+        """Unpack data bytes starting at offset"""
         (
             satellite_system_value,
             self.prn_satellite_number,
             self.elevation,
             self.azimuth,
             self.number_of_frequencies,
-        ) = self._structure.unpack_from(data)
+        ) = self._structure.unpack_from(data, offset)
 
         self.satellite_system = SatelliteSystem(satellite_system_value)
 
-        self.frequency_information = [
-            FrequencyInformation()
-        ] * self.number_of_frequencies
+        self.frequency_information = []
         for i in range(self.number_of_frequencies):
-            index = 6 + i * FrequencyInformation.LENGTH
-            self.frequency_information[i].unpack(
-                data[index : index + FrequencyInformation.LENGTH]
-            )
+            index = offset + self.MINIMUM_LENGTH + i * FrequencyInformation.LENGTH
+            frequency_information = FrequencyInformation()
+            frequency_information.unpack(data, index)
+            self.frequency_information.append(frequency_information)
 
 
-@dataclass()
+@dataclass(slots=True)
 class RawSatelliteDataPacket:
     """Packet 60 - Raw Satellite Data Packet"""
 
@@ -225,19 +220,18 @@ class RawSatelliteDataPacket:
                 self.number_of_satellites,
             ) = self._structure.unpack_from(an_packet.data)
 
-            self.satellite_data = [SatelliteData()] * self.number_of_satellites
+            self.satellite_data = []
 
-            number_of_previous_frequencies = 0
+            index = self.HEAD_LENGTH
             for i in range(self.number_of_satellites):
-                index = (
-                    self.HEAD_LENGTH
-                    + i * SatelliteData.MINIMUM_LENGTH
-                    + number_of_previous_frequencies * FrequencyInformation.LENGTH
+                satellite_data = SatelliteData()
+                satellite_data.unpack(an_packet.data, index)
+                self.satellite_data.append(satellite_data)
+                # Each satellite is followed by all of its frequencies
+                index += (
+                    SatelliteData.MINIMUM_LENGTH
+                    + satellite_data.number_of_frequencies * FrequencyInformation.LENGTH
                 )
-                self.satellite_data[i].unpack(an_packet.data[index:])
-                number_of_previous_frequencies = self.satellite_data[
-                    i
-                ].number_of_frequencies
             return 0
         else:
             return 1
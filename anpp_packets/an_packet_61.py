@@ -31,34 +31,30 @@ from dataclasses import dataclass, field
 import struct
 from typing import List
 from anpp_packets.an_packets import PacketID
-from anpp_packets.an_packet_protocol import ANPacket
+from anpp_packets.an_packet_protocol import ANPacket, BitField, FlagWord
 from anpp_packets.an_packet_31 import SatelliteSystem
 
 
-@dataclass()
-class GPSFlags:
+@dataclass(slots=True, init=False)
+class GPSFlags(FlagWord):
     """GPS Flags"""
 
-    l2p_data: bool = False
-    l2_codes: int = 0
-    anti_spoofing: bool = False
-    satellite_health: int = 0
-    fit_interval: bool = False
-    ura_bad: bool = False
-    satellite_type: int = 0
+    value: int = 0
+
+    l2p_data = BitField(0)
+    l2_codes = BitField(1, 2, int)
+    anti_spoofing = BitField(3)
+    satellite_health = BitField(4, 6, int)
+    fit_interval = BitField(10)
+    ura_bad = BitField(11)
+    satellite_type = BitField(12, 2, int)
 
     def unpack(self, data):
         """Unpack data bytes"""
-        self.l2p_data = (data & (1 << 0)) != 0
-        self.l2_codes = (data >> 1) & 0x0003
-        self.anti_spoofing = (data & (1 << 3)) != 0
-        self.satellite_health = (data >> 4) & 0x003F
-        self.fit_interval = (data & (1 << 10)) != 0
-        self.ura_bad = (data & (1 << 11)) != 0
-        self.satellite_type = (data >> 12) & 0x0003
+        self.value = data
 
 
-@dataclass()
+@dataclass(slots=True)
 class RawSatelliteGPSEphemerisPacket:
     """Packet 61 - Raw Satellite Ephemeris Packet (GPS)"""
 
@@ -141,7 +137,7 @@ class RawSatelliteGPSEphemerisPacket:
             return 1
 
 
-@dataclass()
+@dataclass(slots=True)
 class RawSatelliteGLONASSEphemerisPacket:
     """Packet 61 - Raw Satellite Ephemeris Packet (GLONASS)"""
 
@@ -192,7 +188,7 @@ class RawSatelliteGLONASSEphemerisPacket:
             return 1
 
 
-@dataclass()
+@dataclass(slots=True)
 class RawSatelliteGPSIonoEphemerisPacket:
     """Packet 61 - Raw Satellite Ephemeris Packet (GPS Ionosphere)"""
 
@@ -209,7 +205,7 @@ class RawSatelliteGPSIonoEphemerisPacket:
 
     LENGTH = 92
 
-    _structure = struct.Struct("<IBBddddddddddHHBBx")
+    _structure = struct.Struct("<IBBddddddddddHHBB")
 
     def decode(self, an_packet: ANPacket) -> int:
         """Decode ANPacket to Raw Satellite Ephemeris Packet (GPS Ionosphere)
@@ -241,7 +237,7 @@ class RawSatelliteGPSIonoEphemerisPacket:
             return 1
 
 
-@dataclass()
+@dataclass(slots=True)
 class RawSatelliteEphemerisPacket:
     """Packet 61 - Raw Satellite Ephemeris Packet"""
 
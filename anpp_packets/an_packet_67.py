@@ -30,24 +30,26 @@
 from dataclasses import dataclass, field
 import struct
 from anpp_packets.an_packets import PacketID
-from anpp_packets.an_packet_protocol import ANPacket
+from anpp_packets.an_packet_protocol import ANPacket, BitField, FlagWord, defined_bits
 
 
-@dataclass()
-class OdometerFlags:
+@dataclass(slots=True, init=False)
+class OdometerFlags(FlagWord):
     """Odometer Flags"""
 
-    reverse_detection_supported: bool = False
+    value: int = 0
+
+    reverse_detection_supported = BitField(0)
 
     def unpack(self, flags_byte):
         """Unpack data bytes"""
-        self.reverse_detection_supported = (flags_byte & (1 << 0)) != 0
+        self.value = flags_byte
 
     def pack(self):
-        return self.reverse_detection_supported << 0
+        return self.value & defined_bits(type(self))
 
 
-@dataclass()
+@dataclass(slots=True)
 class ExternalOdometerPacket:
     """Packet 67 - External Odometer Packet"""
 
@@ -30,33 +30,29 @@
 from dataclasses import dataclass, field
 import struct
 from anpp_packets.an_packets import PacketID
-from anpp_packets.an_packet_protocol import ANPacket
+from anpp_packets.an_packet_protocol import ANPacket, BitField, FlagWord, defined_bits
 
 
-@dataclass()
-class ExternalAirDataFlags:
+@dataclass(slots=True, init=False)
+class ExternalAirDataFlags(FlagWord):
     """External Air Data Flags"""
 
-    barometric_altitude_set_and_valid: bool = False
-    airspeed_set_and_valid: bool = False
-    barometric_altitude_reference_reset: bool = False
+    value: int = 0
+
+    barometric_altitude_set_and_valid = BitField(0)
+    airspeed_set_and_valid = BitField(1)
+    barometric_altitude_reference_reset = BitField(2)
 
     def unpack(self, data):
         """Unpack data bytes"""
-        self.barometric_altitude_set_and_valid = (data & (1 << 0)) != 0
-        self.airspeed_set_and_valid = (data & (1 << 1)) != 0
-        self.barometric_altitude_reference_reset = (data & (1 << 2)) != 0
+        self.value = data
 
     def pack(self):
         """Pack to data bytes"""
-        return (
-            (self.barometric_altitude_set_and_valid << 0)
-            & (self.airspeed_set_and_valid << 1)
-            & (self.barometric_altitude_reference_reset << 2)
-        )
+        return self.value & defined_bits(type(self))
 
 
-@dataclass()
+@dataclass(slots=True)
 class ExternalAirDataPacket:
     """Packet 68 - External Air Data Packet"""
 
@@ -112,28 +108,25 @@ class ExternalAirDataPacket:
         return an_packet
 
 
-@dataclass()
-class AirDataFlags:
+@dataclass(slots=True, init=False)
+class AirDataFlags(FlagWord):
     """Air Data Flags"""
 
-    barometric_altitude_valid: bool = False
-    airspeed_valid: bool = False
-    barometric_altitude_sensor_over_range: bool = False
-    airspeed_sensor_overrange: bool = False
-    barometric_altitude_sensor_failure: bool = False
-    airspeed_sensor_failure: bool = False
+    value: int = 0
+
+    barometric_altitude_valid = BitField(0)
+    airspeed_valid = BitField(1)
+    barometric_altitude_sensor_over_range = BitField(2)
+    airspeed_sensor_overrange = BitField(3)
+    barometric_altitude_sensor_failure = BitField(4)
+    airspeed_sensor_failure = BitField(5)
 
     def unpack(self, data):
         """Unpack data bytes"""
-        self.barometric_altitude_valid = (data & (1 << 0)) != 0
-        self.airspeed_valid = (data & (1 << 1)) != 0
-        self.barometric_altitude_sensor_over_range = (data & (1 << 2)) != 0
-        self.airspeed_sensor_overrange = (data & (1 << 3)) != 0
-        self.barometric_altitude_sensor_failure = (data & (1 << 4)) != 0
-        self.airspeed_sensor_failure = (data & (1 << 5)) != 0
+        self.value = data
 
 
-@dataclass()
+@dataclass(slots=True)
 class AirDataPacket:
     """Packet 68 - Air Data Packet"""
 
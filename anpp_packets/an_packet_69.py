@@ -86,7 +86,7 @@ class RTKSoftwareLicenseAccuracy(Enum):
     hor_0_008m_ver_0_02m = 5
 
 
-@dataclass()
+@dataclass(slots=True)
 class AdvancedNavigationGNSSReceiverInformation:
     """Advanced Navigation GNSS Receiver Information"""
 
@@ -113,7 +113,7 @@ class AdvancedNavigationGNSSReceiverInformation:
         ) = values[26:28]
 
 
-@dataclass()
+@dataclass(slots=True)
 class TrimbleGNSSReceiverInformation:
     """Trimble GNSS Receiver Information"""
 
@@ -153,7 +153,7 @@ class TrimbleGNSSReceiverInformation:
         self.rtk_software_license_accuracy = RTKSoftwareLicenseAccuracy(values[20])
 
 
-@dataclass()
+@dataclass(slots=True)
 class GNSSReceiverInformationPacket:
     """Packet 69 - GNSS Receiver Information Packet"""
 
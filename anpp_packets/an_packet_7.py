@@ -51,7 +51,7 @@ class FileTransferMetadata(Enum):
     an_firmware = 3
 
 
-@dataclass()
+@dataclass(slots=True)
 class FileTransferFirstPacket:
     """Packet 7 - File Transfer Request Packet"""
 
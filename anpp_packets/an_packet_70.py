@@ -31,29 +31,27 @@ from dataclasses import dataclass, field
 import struct
 from typing import List
 from anpp_packets.an_packets import PacketID
-from anpp_packets.an_packet_protocol import ANPacket
+from anpp_packets.an_packet_protocol import ANPacket, BitField, FlagWord
 
 
-@dataclass
-class RawDVLDataFlags:
+@dataclass(slots=True, init=False)
+class RawDVLDataFlags(FlagWord):
     """Raw DVL Data Flags"""
 
-    bottom_velocity_valid: bool = False
-    water_velocity_valid: bool = False
-    temperature_valid: bool = False
-    depth_valid: bool = False
-    altitude_valid: bool = False
+    value: int = 0
+
+    bottom_velocity_valid = BitField(0)
+    water_velocity_valid = BitField(1)
+    temperature_valid = BitField(2)
+    depth_valid = BitField(3)
+    altitude_valid = BitField(4)
 
     def unpack(self, data):
         """Unpack data bytes"""
-        self.bottom_velocity_valid = (data & (1 << 0)) != 0
-        self.water_velocity_valid = (data & (1 << 1)) != 0
-        self.temperature_valid = (data & (1 << 2)) != 0
-        self.depth_valid = (data & (1 << 3)) != 0
-        self.altitude_valid = (data & (1 << 4)) != 0
+        self.value = data
 
 
-@dataclass()
+@dataclass(slots=True)
 class RawDVLDataPacket:
     """Packet 70 - Raw DVL Data Packet"""
 
@@ -30,47 +30,33 @@
 from dataclasses import dataclass, field
 import struct
 from anpp_packets.an_packets import PacketID
-from anpp_packets.an_packet_protocol import ANPacket
+from anpp_packets.an_packet_protocol import ANPacket, BitField, FlagWord, defined_bits
 
 
-@dataclass()
-class NorthSeekingInitialisationStatusFlags:
+@dataclass(slots=True, init=False)
+class NorthSeekingInitialisationStatusFlags(FlagWord):
     """North Seeking Initialisation Status Flags"""
 
-    north_seeking_initialised: bool = False
-    position_not_ready: bool = False
-    excessive_roll: bool = False
-    excessive_pitch: bool = False
-    excessive_movement: bool = False
-    latitude_change: bool = False
-    lever_arm_offset_change: bool = False
-    latitude_check_failed: bool = False
+    value: int = 0
+
+    north_seeking_initialised = BitField(0)
+    position_not_ready = BitField(1)
+    excessive_roll = BitField(2)
+    excessive_pitch = BitField(3)
+    excessive_movement = BitField(4)
+    latitude_change = BitField(5)
+    lever_arm_offset_change = BitField(6)
+    latitude_check_failed = BitField(7)
 
     def unpack(self, data):
         """Unpack data bytes"""
-        self.north_seeking_initialised = (data & (1 << 0)) != 0
-        self.position_not_ready = (data & (1 << 1)) != 0
-        self.excessive_roll = (data & (1 << 2)) != 0
-        self.excessive_pitch = (data & (1 << 3)) != 0
-        self.excessive_movement = (data & (1 << 4)) != 0
-        self.latitude_change = (data & (1 << 5)) != 0
-        self.lever_arm_offset_change = (data & (1 << 6)) != 0
-        self.latitude_check_failed = (data & (1 << 7)) != 0
+        self.value = data
 
     def pack(self):
-        return (
-            (self.north_seeking_initialised << 0)
-            & (self.position_not_ready << 1)
-            & (self.excessive_roll << 2)
-            & (self.excessive_pitch << 3)
-            & (self.excessive_movement << 4)
-            & (self.latitude_change << 5)
-            & (self.lever_arm_offset_change << 6)
-            & (self.latitude_check_failed << 7)
-        )
+        return self.value & defined_bits(type(self))
 
 
-@dataclass()
+@dataclass(slots=True)
 class NorthSeekingInitialisationStatusPacket:
     """Packet 71 - North Seeking Initialisation Status Packet"""
 
@@ -33,7 +33,7 @@ from anpp_packets.an_packets import PacketID
 from anpp_packets.an_packet_protocol import ANPacket
 
 
-@dataclass
+@dataclass(slots=True)
 class AutomotivePacket:
     """Packet 73 - Automotive Packet"""
 
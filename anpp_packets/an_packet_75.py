@@ -31,25 +31,26 @@ from dataclasses import dataclass, field
 import struct
 from typing import List
 from anpp_packets.an_packets import PacketID
-from anpp_packets.an_packet_protocol import ANPacket
+from anpp_packets.an_packet_protocol import ANPacket, BitField, FlagWord, defined_bits
 
 
-@dataclass()
-class ExternalMagnetometersFlags:
+@dataclass(slots=True, init=False)
+class ExternalMagnetometersFlags(FlagWord):
     """External Magnetometers Flags"""
 
-    failure: bool = False
-    overrange: bool = False
+    value: int = 0
+
+    failure = BitField(0)
+    overrange = BitField(1)
 
     def unpack(self, data):
-        self.failure = (data & (1 << 0)) != 0
-        self.overrange = (data & (1 << 1)) != 0
+        self.value = data
 
     def pack(self):
-        return (self.failure << 0) & (self.overrange << 1)
+        return self.value & defined_bits(type(self))
 
 
-@dataclass()
+@dataclass(slots=True)
 class ExternalMagnetometersPacket:
     """Packet 75 - External Magnetometers Packet"""
 
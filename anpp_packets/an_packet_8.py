@@ -55,7 +55,7 @@ class FileTransferResponse(Enum):
     access_denied = 129
 
 
-@dataclass()
+@dataclass(slots=True)
 class FileTransferAcknowledgePacket:
     """Packet 8 - File Transfer Acknowledge Packet"""
 
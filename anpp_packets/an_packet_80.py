@@ -34,7 +34,7 @@ from anpp_packets.an_packet_protocol import ANPacket
 from anpp_packets.an_packet_20 import GNSSFixType
 
 
-@dataclass()
+@dataclass(slots=True)
 class BasestationPacket:
     """Packet 80 - Basestation Packet"""
 
@@ -31,21 +31,27 @@ from dataclasses import dataclass, field
 import struct
 from typing import List
 from anpp_packets.an_packets import PacketID
-from anpp_packets.an_packet_protocol import ANPacket
+from anpp_packets.an_packet_protocol import ANPacket, BitField, FlagWord
 from anpp_packets.an_packet_31 import SatelliteFrequencies
 
 
-@dataclass()
-class ExtendedSatelliteFlags:
+@dataclass(slots=True, init=False)
+class ExtendedSatelliteFlags(FlagWord):
     """Extended Satellite Flags"""
 
-    visible_by_receiver_1: bool = False
-    visible_by_receiver_2: bool = False
-    used_in_primary_position_solution: bool = False
-    used_in_moving_baseline_solution: bool = False
+    value: int = 0
 
+    visible_by_receiver_1 = BitField(0)
+    visible_by_receiver_2 = BitField(1)
+    used_in_primary_position_solution = BitField(2)
+    used_in_moving_baseline_solution = BitField(3)
 
-@dataclass()
+    def unpack(self, data):
+        """Unpack data bytes"""
+        self.value = data
+
+
+@dataclass(slots=True)
 class ExtendedSatellite:
     """Extended Satellite"""
 
@@ -66,21 +72,24 @@ class ExtendedSatellite:
 
     _structure = struct.Struct("<BBbBHBBB")
 
-    def unpack(self, data):
-        """Unpack data bytes"""
+    def unpack(self, data, offset=0):
+        """Unpack data bytes starting at offset"""
         (
             self.satellite_system,
             self.number,
-            self.frequencies,
+            frequency_value,
             self.elevation,
             self.azimuth,
             self.snr1,
             self.snr2,
-            self.flags,
-        ) = self._structure.unpack_from(data)
+            flags_value,
+        ) = self._structure.unpack_from(data, offset)
+
+        self.frequencies.unpack(frequency_value)
+        self.flags.unpack(flags_value)
 
 
-@dataclass()
+@dataclass(slots=True)
 class ExtendedSatellitesPacket:
     """Packet 84 - Extended Satellites Packet"""
 
@@ -101,17 +110,15 @@ class ExtendedSatellitesPacket:
             ((len(an_packet.data) - self.MINIMUM_LENGTH) % ExtendedSatellite.LENGTH)
             == 0
         ):
-            number_of_satellites = int(
-                (len(an_packet.data) - self.MINIMUM_LENGTH) / ExtendedSatellite.LENGTH
-            )
             self.total_number_of_packets = an_packet.data[0]
             self.packet_number = an_packet.data[1]
-            self.extended_satellites = [ExtendedSatellite()] * number_of_satellites
-            for i in range(number_of_satellites):
-                index = self.MINIMUM_LENGTH + i * ExtendedSatellite.LENGTH
-                self.extended_satellites[i].unpack(
-                    an_packet.data[index : index + ExtendedSatellite.LENGTH]
-                )
+            self.extended_satellites = []
+            for index in range(
+                self.MINIMUM_LENGTH, len(an_packet.data), ExtendedSatellite.LENGTH
+            ):
+                satellite = ExtendedSatellite()
+                satellite.unpack(an_packet.data, index)
+                self.extended_satellites.append(satellite)
             return 0
         else:
             return 1
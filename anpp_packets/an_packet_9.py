@@ -33,7 +33,7 @@ from anpp_packets.an_packets import PacketID
 from anpp_packets.an_packet_protocol import ANPacket
 
 
-@dataclass()
+@dataclass(slots=True)
 class FileTransferOngoingPacket:
     """Packet 9 - File Transfer Ongoing Packet"""
 
@@ -48,8 +48,9 @@ class FileTransferOngoingPacket:
     def encode(self) -> ANPacket:
         """Encode File Transfer Ongoing Packet to ANPacket
         Returns the ANPacket"""
-        data = self._structure.pack(self.unique_id, self.data_index)
-        data += self.packet_data
+        data = bytearray(self._structure.size + len(self.packet_data))
+        self._structure.pack_into(data, 0, self.unique_id, self.data_index)
+        data[self._structure.size :] = self.packet_data
 
         an_packet = ANPacket()
         an_packet.encode(self.ID, len(data), data)
@@ -0,0 +1,219 @@
+################################################################################
+##                                                                            ##
+##                   Advanced Navigation Python Language SDK                  ##
+##                             an_packet_arrays.py                            ##
+##                     Copyright 2023, Advanced Navigation                    ##
+##                                                                            ##
+################################################################################
+#                                                                              #
+# Copyright (C) 2023 Advanced Navigation                                       #
+#                                                                              #
+# Permission is hereby granted, free of charge, to any person obtaining        #
+# a copy of this software and associated documentation files (the "Software"), #
+# to deal in the Software without restriction, including without limitation    #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,     #
+# and/or sell copies of the Software, and to permit persons to whom the        #
+# Software is furnished to do so, subject to the following conditions:         #
+#                                                                              #
+# The above copyright notice and this permission notice shall be included      #
+# in all copies or substantial portions of the Software.                       #
+#                                                                              #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS      #
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,  #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE  #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER       #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING      #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER          #
+# DEALINGS IN THE SOFTWARE.                                                    #
+################################################################################
+from dataclasses import fields, MISSING
+from functools import lru_cache
+from typing import Dict, Iterable, Tuple
+import re
+import numpy as np
+
+from anpp_packets.an_packets import PacketID
+from anpp_packets.an_packet_protocol import ANDecoder, BitField, DecodedANPacket
+from anpp_packets.an_packet_20 import SystemStatePacket
+from anpp_packets.an_packet_31 import DetailedSatellite
+from anpp_packets.an_packet_84 import ExtendedSatellite
+from anpp_packets.an_packet_181 import PacketPeriod
+
+# NumPy equivalents of the struct format characters used by the packet classes
+STRUCT_DTYPE_CODES = {
+    "b": "i1",
+    "B": "u1",
+    "h": "<i2",
+    "H": "<u2",
+    "i": "<i4",
+    "I": "<u4",
+    "q": "<i8",
+    "Q": "<u8",
+    "f": "<f4",
+    "d": "<f8",
+}
+
+_struct_item = re.compile(r"(\d*)([xbBhHiIqQfd])")
+
+
+@lru_cache(maxsize=None)
+def packet_dtype(packet_class) -> np.dtype:
+    """Derives a structured NumPy dtype from a fixed length packet class. Each
+    dataclass field becomes a column, list fields become sub-arrays and flag
+    or enum fields stay raw integer columns, decoded with BitField.extract or
+    flag_columns. Raises ValueError if the class _structure does not describe
+    LENGTH bytes field by field."""
+    structure = getattr(packet_class, "_structure", None)
+    length = getattr(packet_class, "LENGTH", None)
+    if structure is None or structure.size != length:
+        raise ValueError(f"{packet_class.__name__} is not a fixed length packet")
+
+    # Expand the struct format into (dtype code, offset) items, skipping padding
+    items = []
+    offset = 0
+    for count, code in _struct_item.findall(structure.format):
+        count = int(count) if count else 1
+        if code == "x":
+            offset += count
+            continue
+        size = np.dtype(STRUCT_DTYPE_CODES[code]).itemsize
+        for _ in range(count):
+            items.append((STRUCT_DTYPE_CODES[code], offset))
+            offset += size
+
+    names, formats, offsets = [], [], []
+    index = 0
+    for packet_field in fields(packet_class):
+        # Reserved fields are covered by padding in the structure
+        if packet_field.name.startswith("reserved") and index == len(items):
+            continue
+        default = (
+            packet_field.default_factory()
+            if packet_field.default_factory is not MISSING
+            else None
+        )
+        shape = ()
+        while isinstance(default, list):
+            shape += (len(default),)
+            default = default[0] if default else None
+        count = int(np.prod(shape))
+        codes = {code for code, _ in items[index : index + count]}
+        if index + count > len(items) or len(codes) != 1:
+            raise ValueError(
+                f"{packet_class.__name__} fields do not match its structure"
+            )
+        code = codes.pop()
+        names.append(packet_field.name)
+        formats.append((code, shape) if shape else code)
+        offsets.append(items[index][1])
+        index += count
+
+    if index != len(items):
+        raise ValueError(
+            f"{packet_class.__name__} fields do not match its structure"
+        )
+
+    return np.dtype(
+        {"names": names, "formats": formats, "offsets": offsets, "itemsize": length}
+    )
+
+
+# Matches SystemStatePacket._structure "<HHIIdddffffffffffffffff". The status
+# words are kept as raw integers, use the BitField extract method of a flag,
+# for example SystemStatus.gnss_failure.extract(array["system_status"]), or
+# flag_columns to decode them.
+SYSTEM_STATE_DTYPE = packet_dtype(SystemStatePacket)
+
+
+# Packets made of a fixed length head followed by repeated fixed length
+# records, by packet ID: (record class, offset of the first record)
+RECORD_LAYOUTS: Dict[PacketID, Tuple[type, int]] = {
+    PacketID.detailed_satellites: (DetailedSatellite, 0),
+    PacketID.extended_satellites: (ExtendedSatellite, 2),
+    PacketID.packets_period: (PacketPeriod, 2),
+}
+
+
+def flag_columns(words: np.ndarray, flag_class) -> Dict[str, np.ndarray]:
+    """Decodes every BitField of a flag class, such as SystemStatus, from an
+    array of status words. Returns a dictionary of flag name to array."""
+    return {
+        name: flag.extract(words)
+        for name, flag in vars(flag_class).items()
+        if isinstance(flag, BitField)
+    }
+
+
+def decode_packet_array(
+    an_packets: Iterable[DecodedANPacket], packet_class
+) -> np.ndarray:
+    """Decodes every packet matching the ID and LENGTH of a fixed length packet
+    class into one structured array, with a single np.frombuffer call over
+    the joined packet data. Packets sharing an ID but not the length, such as
+    the Air Data Unit variant of the raw sensors packet, are left out."""
+    dtype = packet_dtype(packet_class)
+    data = b"".join(
+        an_packet.data
+        for an_packet in an_packets
+        if an_packet.id == packet_class.ID and an_packet.length == packet_class.LENGTH
+    )
+    return np.frombuffer(data, dtype=dtype)
+
+
+def read_packets(log_bytes: bytes, packet_ids: Iterable[PacketID]):
+    """Returns all packets with the given IDs in a raw ANPP byte stream, such as
+    a log file read into memory, skipping all other packets undecoded"""
+    decoder = ANDecoder()
+    decoder.subscribe(packet_ids)
+    decoder.add_data(log_bytes)
+    return decoder.decode_all()
+
+
+def read_packet_array(log_bytes: bytes, packet_class) -> np.ndarray:
+    """Decodes every packet of a fixed length packet class in a raw ANPP byte
+    stream into a structured array"""
+    return decode_packet_array(read_packets(log_bytes, [packet_class.ID]), packet_class)
+
+
+def decode_system_state_array(an_packets: Iterable[DecodedANPacket]) -> np.ndarray:
+    """Decodes system state packets into a structured array with one row per
+    packet and one column per SystemStatePacket field"""
+    return decode_packet_array(an_packets, SystemStatePacket)
+
+
+def read_system_state_log(log_bytes: bytes) -> np.ndarray:
+    """Decodes every system state packet in a raw ANPP byte stream into a
+    structured array"""
+    return read_packet_array(log_bytes, SystemStatePacket)
+
+
+def decode_record_array(an_packet: DecodedANPacket) -> np.ndarray:
+    """Decodes the repeated records of a packet listed in RECORD_LAYOUTS, such
+    as every satellite of a detailed satellites packet, into a structured
+    array with one row per record. The array is a single np.frombuffer view
+    of the packet data, so each record is a separate row and nothing is
+    sliced or copied per record. Raises ValueError if the packet is not made
+    of whole records."""
+    record_class, offset = RECORD_LAYOUTS[an_packet.id]
+    dtype = packet_dtype(record_class)
+    count, remainder = divmod(len(an_packet.data) - offset, dtype.itemsize)
+    if count < 0 or remainder != 0:
+        raise ValueError(f"packet {an_packet.id} is not made of whole records")
+    return np.frombuffer(an_packet.data, dtype=dtype, count=count, offset=offset)
+
+
+def decode_record_arrays(
+    an_packets: Iterable[DecodedANPacket], packet_id: PacketID
+) -> np.ndarray:
+    """Decodes the records of every packet with a packet ID listed in
+    RECORD_LAYOUTS into one structured array, for example all satellites of
+    all detailed satellites packets in a log"""
+    record_class, _ = RECORD_LAYOUTS[packet_id]
+    arrays = [
+        decode_record_array(an_packet)
+        for an_packet in an_packets
+        if an_packet.id == packet_id
+    ]
+    if not arrays:
+        return np.empty(0, dtype=packet_dtype(record_class))
+    return np.concatenate(arrays)
@@ -0,0 +1,205 @@
+################################################################################
+##                                                                            ##
+##                   Advanced Navigation Python Language SDK                  ##
+##                            an_packet_dispatch.py                           ##
+##                     Copyright 2023, Advanced Navigation                    ##
+##                                                                            ##
+################################################################################
+#                                                                              #
+# Copyright (C) 2023 Advanced Navigation                                       #
+#                                                                              #
+# Permission is hereby granted, free of charge, to any person obtaining        #
+# a copy of this software and associated documentation files (the "Software"), #
+# to deal in the Software without restriction, including without limitation    #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,     #
+# and/or sell copies of the Software, and to permit persons to whom the        #
+# Software is furnished to do so, subject to the following conditions:         #
+#                                                                              #
+# The above copyright notice and this permission notice shall be included      #
+# in all copies or substantial portions of the Software.                       #
+#                                                                              #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS      #
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,  #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE  #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER       #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING      #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER          #
+# DEALINGS IN THE SOFTWARE.                                                    #
+################################################################################
+import struct
+import sys
+from functools import lru_cache
+from importlib import import_module
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from anpp_packets.an_packet_protocol import AN_MAXIMUM_PACKET_SIZE, ANPacket
+
+
+class PacketDispatcher:
+    """Precomputed table mapping packet ID and data length to the packet class
+    decoding it, so a received packet is turned into the right object with a
+    single dictionary lookup. With a loader the table is filled one packet ID
+    at a time, the first time that ID is received."""
+
+    def __init__(
+        self,
+        packet_classes: Iterable[type] = (),
+        loader: Optional[Callable[[int], Iterable[type]]] = None,
+    ):
+        self.table: Dict[Tuple[int, int], type] = {}
+        self.loader = loader
+        self.loaded_ids: Set[int] = set()
+        self.packet_ids: Set[int] = set()  # IDs with at least one packet class
+        self.add(packet_classes)
+
+    def add(self, packet_classes: Iterable[type]):
+        """Adds packet classes to the table. All classes sharing a packet ID
+        must be added together for fixed lengths to take precedence."""
+        fixed = []
+        for packet_class in packet_classes:
+            self.packet_ids.add(int(packet_class.ID))
+            length = getattr(packet_class, "LENGTH", None)
+            if isinstance(length, int):
+                fixed.append(packet_class)
+            else:
+                # Variable length packets validate the length in decode
+                for length in range(AN_MAXIMUM_PACKET_SIZE + 1):
+                    self.table[(int(packet_class.ID), length)] = packet_class
+
+        # Fixed length classes take precedence for their exact length
+        for packet_class in fixed:
+            self.table[(int(packet_class.ID), packet_class.LENGTH)] = packet_class
+
+    def packet_class(self, packet_id: int, length: int):
+        """Returns the packet class for a packet ID and length or None"""
+        packet_class = self.table.get((packet_id, length))
+        if packet_class is None and self.load(packet_id):
+            packet_class = self.table.get((int(packet_id), length))
+        return packet_class
+
+    def load(self, packet_id: int) -> bool:
+        """Adds the packet classes of a packet ID from the loader the first
+        time the ID is seen. Returns True if classes were loaded."""
+        packet_id = int(packet_id)
+        if self.loader is None or packet_id in self.loaded_ids:
+            return False
+        self.loaded_ids.add(packet_id)
+        self.add(self.loader(packet_id))
+        return True
+
+    def is_known(self, packet_id: int) -> bool:
+        """Returns True if the device has a packet class for the packet ID at
+        any length, so a packet with that ID that decodes to None is malformed
+        rather than unknown"""
+        self.load(packet_id)
+        return int(packet_id) in self.packet_ids
+
+    def decode(self, an_packet: ANPacket):
+        """Decodes an ANPacket into a new object of its packet class. Returns
+        None if no class matches or the packet fails to decode."""
+        packet_class = self.table.get((an_packet.id, an_packet.length))
+        if packet_class is None:
+            packet_class = self.packet_class(an_packet.id, an_packet.length)
+            if packet_class is None:
+                return None
+        packet = packet_class()
+        try:
+            if packet.decode(an_packet) != 0:
+                return None
+        except (ValueError, struct.error):
+            # Field values outside their enum, such as an unknown acknowledge
+            # result, fail to decode like a packet of the wrong length
+            return None
+        return packet
+
+
+def is_decodable_packet_class(value) -> bool:
+    """Returns True for packet classes with a packet ID and a decode method"""
+    return (
+        isinstance(value, type)
+        and hasattr(value, "ID")
+        and callable(getattr(value, "decode", None))
+    )
+
+
+# Lazy packet imports of each device module, by module name
+lazy_packet_imports: Dict[str, "LazyPacketImports"] = {}
+
+
+class LazyPacketImports:
+    """Packet classes and enums of a device module, imported from their
+    an_packet_<ID> module on first access. Install resolve and names as the
+    module __getattr__ and __dir__ so a process only imports the packet
+    modules it actually uses.
+
+    Names are given per packet ID and may use "Name as Alias" to export a
+    packet class under another name, as done for device specific variants."""
+
+    def __init__(self, module_name: str, packets: Mapping[int, Tuple[str, ...]]):
+        self.module_name = module_name
+        self.attributes: Dict[str, Tuple[int, str]] = {}
+        self.packet_names: Dict[int, List[str]] = {}
+        for packet_id, names in packets.items():
+            for name in names:
+                attribute, _, alias = name.partition(" as ")
+                alias = alias or attribute
+                self.attributes[alias] = (packet_id, attribute)
+                self.packet_names.setdefault(packet_id, []).append(alias)
+        lazy_packet_imports[module_name] = self
+
+    def resolve(self, name: str):
+        """Imports and returns a packet attribute, caching it in the module"""
+        try:
+            packet_id, attribute = self.attributes[name]
+        except KeyError:
+            raise AttributeError(
+                f"module {self.module_name!r} has no attribute {name!r}"
+            ) from None
+        module = import_module(f"anpp_packets.an_packet_{packet_id}")
+        value = getattr(module, attribute)
+        setattr(sys.modules[self.module_name], name, value)
+        return value
+
+    def names(self) -> List[str]:
+        """Returns the module attributes including packets not imported yet"""
+        namespace = vars(sys.modules[self.module_name])
+        return sorted(set(namespace) | set(self.attributes))
+
+    def packet_classes(self, packet_id: int) -> Set[type]:
+        """Imports and returns the decodable packet classes for a packet ID,
+        including any the module imports directly"""
+        for name in self.packet_names.get(packet_id, ()):
+            self.resolve(name)
+        namespace = vars(sys.modules[self.module_name])
+        return {
+            value
+            for value in namespace.values()
+            if is_decodable_packet_class(value) and int(value.ID) == packet_id
+        }
+
+
+@lru_cache(maxsize=None)
+def dispatcher_for_module(module_name: str) -> PacketDispatcher:
+    """Returns the dispatcher for the packet classes a device module imports.
+    Device modules import their own variant where packets share an ID, such
+    as RawSensorsPacketAdu for the Air Data Unit, so each device gets the
+    classes that match its output. Lazily imported packets are only loaded
+    once their packet ID is received."""
+    lazy = lazy_packet_imports.get(module_name)
+    if lazy is not None:
+        return PacketDispatcher(loader=lazy.packet_classes)
+    namespace = vars(sys.modules[module_name])
+    packet_classes = {
+        value for value in namespace.values() if is_decodable_packet_class(value)
+    }
+    return PacketDispatcher(packet_classes)
+
+
+def dispatcher_for_class(device_class: type) -> PacketDispatcher:
+    """Returns the dispatcher of the nearest device module in the class
+    hierarchy that lists lazy packet imports, so a device subclassed in
+    another module keeps the packets of its device"""
+    for base in device_class.__mro__:
+        if base.__module__ in lazy_packet_imports:
+            return dispatcher_for_module(base.__module__)
+    return dispatcher_for_module(device_class.__module__)
@@ -0,0 +1,179 @@
+################################################################################
+##                                                                            ##
+##                   Advanced Navigation Python Language SDK                  ##
+##                           an_packet_ephemeris.py                           ##
+##                     Copyright 2023, Advanced Navigation                    ##
+##                                                                            ##
+################################################################################
+#                                                                              #
+# Copyright (C) 2023 Advanced Navigation                                       #
+#                                                                              #
+# Permission is hereby granted, free of charge, to any person obtaining        #
+# a copy of this software and associated documentation files (the "Software"), #
+# to deal in the Software without restriction, including without limitation    #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,     #
+# and/or sell copies of the Software, and to permit persons to whom the        #
+# Software is furnished to do so, subject to the following conditions:         #
+#                                                                              #
+# The above copyright notice and this permission notice shall be included      #
+# in all copies or substantial portions of the Software.                       #
+#                                                                              #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS      #
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,  #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE  #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER       #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING      #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER          #
+# DEALINGS IN THE SOFTWARE.                                                    #
+################################################################################
+from typing import Dict, Optional, Tuple
+import numpy as np
+
+from anpp_packets.an_packet_protocol import DecodedANPacket
+from anpp_packets.an_packet_31 import SatelliteSystem
+from anpp_packets.an_packet_61 import (
+    RawSatelliteEphemerisPacket,
+    RawSatelliteGLONASSEphemerisPacket,
+    RawSatelliteGPSEphemerisPacket,
+    RawSatelliteGPSIonoEphemerisPacket,
+)
+from anpp_packets.an_packet_arrays import packet_dtype
+
+
+class EphemerisTable:
+    """Ephemerides of one packet 61 variant, kept as structured records per
+    satellite system and satellite number in order of reception.
+
+    Ephemerides are broadcast repeatedly, so a record with the same issue of
+    data fields as a stored one replaces its contents instead of being added,
+    latest wins, while keeping the time it was first received. With max_age
+    set, records whose unix_time is more than max_age seconds older than the
+    newest record of the satellite are evicted."""
+
+    def __init__(self, packet_class, identity: Tuple[str, ...], max_age=None):
+        self.dtype = packet_dtype(packet_class)
+        self.identity = identity
+        self.max_age = max_age
+        self.records: Dict[Tuple[int, int], np.ndarray] = {}
+
+    def add(self, data) -> bool:
+        """Adds an ephemeris from packet data. Returns True if it is new."""
+        return self.insert(np.frombuffer(data, dtype=self.dtype, count=1).copy())
+
+    def insert(self, record: np.ndarray) -> bool:
+        """Adds a one element structured record. Returns True if it is new."""
+        key = (int(record["satellite_system"][0]), int(record["satellite_number"][0]))
+        records = self.records.get(key)
+        if records is None:
+            self.records[key] = record
+            return True
+
+        same = np.ones(len(records), dtype=bool)
+        for name in self.identity:
+            equal = records[name] == record[name]
+            same &= equal.reshape(len(records), -1).all(axis=1)
+        if same.any():
+            record["unix_time"] = records["unix_time"][same][0]
+            records[same] = record
+            return False
+
+        records = np.concatenate([records, record])
+        if records["unix_time"][-1] < records["unix_time"][-2]:
+            records = records[np.argsort(records["unix_time"], kind="stable")]
+        if self.max_age is not None:
+            oldest = int(records["unix_time"][-1]) - self.max_age
+            records = records[records["unix_time"] >= max(oldest, 0)]
+        self.records[key] = records
+        return True
+
+    def satellite(self, satellite_system: SatelliteSystem, number: int) -> np.ndarray:
+        """Returns every stored record of a satellite in order of reception"""
+        records = self.records.get((satellite_system.value, number))
+        if records is None:
+            return np.empty(0, dtype=self.dtype)
+        return records
+
+    def lookup(
+        self, satellite_system: SatelliteSystem, number: int, unix_times
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the record in use at each of an array of unix times, being
+        the latest received at or before that time, and a boolean array that
+        is False where no record had been received yet. One searchsorted call
+        covers all times, so a whole log needs no rescan of the stream."""
+        records = self.satellite(satellite_system, number)
+        indices = np.searchsorted(records["unix_time"], unix_times, side="right") - 1
+        valid = indices >= 0
+        if not len(records):
+            return records, valid
+        return records[np.maximum(indices, 0)], valid
+
+    def at(self, satellite_system: SatelliteSystem, number: int, unix_time: int):
+        """Returns the record in use at a unix time or None"""
+        records, valid = self.lookup(satellite_system, number, [unix_time])
+        return records[0] if valid[0] else None
+
+    def all(self) -> np.ndarray:
+        """Returns all stored records as one structured array"""
+        if not self.records:
+            return np.empty(0, dtype=self.dtype)
+        return np.concatenate(list(self.records.values()))
+
+
+class EphemerisCache:
+    """Cache of raw satellite ephemerides from packet 61, indexed by satellite
+    system and satellite number. The cache can be saved to and loaded from a
+    compressed .npz file holding the packed records, so ephemerides gathered
+    in one session are available in the next."""
+
+    def __init__(self, max_age: Optional[int] = None):
+        self.gps = EphemerisTable(
+            RawSatelliteGPSEphemerisPacket,
+            ("issue_of_data_ephemeris", "time_of_ephemeris"),
+            max_age,
+        )
+        self.glonass = EphemerisTable(
+            RawSatelliteGLONASSEphemerisPacket, ("frame_start_time",), max_age
+        )
+        self.gps_iono = EphemerisTable(
+            RawSatelliteGPSIonoEphemerisPacket, ("alpha", "beta"), max_age
+        )
+        self.tables: Dict[str, EphemerisTable] = {
+            "gps": self.gps,
+            "glonass": self.glonass,
+            "gps_iono": self.gps_iono,
+        }
+        # Variants are told apart by their length, as in packet 61 decode
+        self.tables_by_length: Dict[int, EphemerisTable] = {
+            RawSatelliteGPSEphemerisPacket.LENGTH: self.gps,
+            RawSatelliteGLONASSEphemerisPacket.LENGTH: self.glonass,
+            RawSatelliteGPSIonoEphemerisPacket.LENGTH: self.gps_iono,
+        }
+
+    def add(self, an_packet: DecodedANPacket) -> bool:
+        """Adds the ephemeris in a raw satellite ephemeris packet. Returns True
+        if it was not in the cache yet."""
+        if an_packet.id != RawSatelliteEphemerisPacket.ID:
+            return False
+        table = self.tables_by_length.get(len(an_packet.data))
+        if table is None:
+            return False
+        return table.add(an_packet.data)
+
+    def save(self, path):
+        """Saves all records to a compressed .npz file"""
+        np.savez_compressed(
+            path, **{name: table.all() for name, table in self.tables.items()}
+        )
+
+    @classmethod
+    def load(cls, path, max_age: Optional[int] = None) -> "EphemerisCache":
+        """Creates a cache from a file written by save"""
+        cache = cls(max_age)
+        with np.load(path) as saved:
+            for name, table in cache.tables.items():
+                if name not in saved:
+                    continue
+                records = saved[name].astype(table.dtype)
+                for index in np.argsort(records["unix_time"], kind="stable"):
+                    table.insert(records[index : index + 1].copy())
+        return cache
@@ -0,0 +1,216 @@
+################################################################################
+##                                                                            ##
+##                   Advanced Navigation Python Language SDK                  ##
+##                         an_packet_observations.py                          ##
+##                     Copyright 2023, Advanced Navigation                    ##
+##                                                                            ##
+################################################################################
+#                                                                              #
+# Copyright (C) 2023 Advanced Navigation                                       #
+#                                                                              #
+# Permission is hereby granted, free of charge, to any person obtaining        #
+# a copy of this software and associated documentation files (the "Software"), #
+# to deal in the Software without restriction, including without limitation    #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,     #
+# and/or sell copies of the Software, and to permit persons to whom the        #
+# Software is furnished to do so, subject to the following conditions:         #
+#                                                                              #
+# The above copyright notice and this permission notice shall be included      #
+# in all copies or substantial portions of the Software.                       #
+#                                                                              #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS      #
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,  #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE  #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER       #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING      #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER          #
+# DEALINGS IN THE SOFTWARE.                                                    #
+################################################################################
+from typing import Dict, List, Set, Tuple
+import numpy as np
+
+from anpp_packets.an_packet_protocol import DecodedANPacket
+from anpp_packets.an_packet_31 import SatelliteSystem
+from anpp_packets.an_packet_60 import (
+    FrequencyInformation,
+    RawSatelliteDataPacket,
+    SatelliteData,
+)
+from anpp_packets.an_packet_arrays import packet_dtype
+
+# Frequency information records as stored in packet 60
+FREQUENCY_DTYPE = packet_dtype(FrequencyInformation)
+
+# One row per observation, indexed by time, receiver, PRN and frequency. The
+# frequency is the SatelliteFrequency enum value of the satellite system.
+OBSERVATION_DTYPE = np.dtype(
+    [
+        ("time", "<i8"),
+        ("receiver_number", "u1"),
+        ("prn", "u1"),
+        ("satellite_frequency", "u1"),
+        ("tracking_status", "u1"),
+        ("pseudo_range", "<f8"),
+        ("carrier_phase", "<f8"),
+        ("doppler_frequency", "<f4"),
+        ("snr", "<f4"),
+    ]
+)
+
+
+class ObservationColumns:
+    """Preallocated observation rows of one satellite system, grown by
+    doubling the capacity when full"""
+
+    def __init__(self, capacity: int):
+        self.rows = np.zeros(capacity, dtype=OBSERVATION_DTYPE)
+        self.count = 0
+
+    def append(self, rows: np.ndarray):
+        end = self.count + len(rows)
+        if end > len(self.rows):
+            grown = np.zeros(max(end, 2 * len(self.rows)), dtype=OBSERVATION_DTYPE)
+            grown[: self.count] = self.rows[: self.count]
+            self.rows = grown
+        self.rows[self.count : end] = rows
+        self.count = end
+
+    def view(self) -> np.ndarray:
+        return self.rows[: self.count]
+
+
+class RawObservationStore:
+    """Streaming store of raw GNSS observations from packet 60. Observations
+    are decoded straight from the packet data into per satellite system
+    columns without building FrequencyInformation objects. Epochs split over
+    several packets are held back until packet_number has reached every one
+    of total_packets, so each epoch is stored whole. Epochs are stored in the
+    order they complete, which is not time order with several receivers or
+    after flush(), so look epochs up with epoch() rather than by position.
+
+    Times are nanoseconds since the unix epoch in the time column."""
+
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self.columns: Dict[SatelliteSystem, ObservationColumns] = {}
+        self.epoch_times = np.zeros(capacity, dtype="<i8")
+        self.epoch_count = 0
+        self.incomplete_epochs = 0
+        # Parts received so far of epochs still waiting for packets, keyed by
+        # epoch time and receiver number
+        self.pending: Dict[Tuple[int, int], Tuple[Set[int], List]] = {}
+
+    def add(self, an_packet: DecodedANPacket) -> bool:
+        """Adds the observations of a raw satellite data packet. Returns True
+        when this packet completes an epoch."""
+        if an_packet.id != RawSatelliteDataPacket.ID:
+            return False
+        data = an_packet.data
+        (
+            unix_time,
+            nanoseconds,
+            _,
+            receiver_number,
+            packet_number,
+            total_packets,
+            number_of_satellites,
+        ) = RawSatelliteDataPacket._structure.unpack_from(data)
+        time = unix_time * 1000000000 + nanoseconds
+
+        # A newer epoch from the same receiver means older parts were lost
+        for key in [
+            key
+            for key in self.pending
+            if key[1] == receiver_number and key[0] < time
+        ]:
+            self.incomplete_epochs += 1
+            self.store_epoch(key, self.pending.pop(key)[1])
+
+        key = (time, receiver_number)
+        packet_numbers, parts = self.pending.setdefault(key, (set(), []))
+        if packet_number in packet_numbers:
+            return False
+        packet_numbers.add(packet_number)
+        parts.append(self.unpack_observations(data, number_of_satellites))
+
+        if len(packet_numbers) < total_packets:
+            return False
+        self.store_epoch(key, self.pending.pop(key)[1])
+        return True
+
+    def flush(self):
+        """Stores any epochs still waiting for packets, such as at the end of
+        a log"""
+        for key in sorted(self.pending):
+            self.incomplete_epochs += 1
+            self.store_epoch(key, self.pending[key][1])
+        self.pending.clear()
+
+    @staticmethod
+    def unpack_observations(data, number_of_satellites: int):
+        """Returns the satellite system and observation row of every frequency
+        in the packet data. Only the satellite headers are walked in Python,
+        the frequency records are joined and decoded with one np.frombuffer,
+        which also copies them out of zero copy packet data."""
+        unpack_satellite = SatelliteData._structure.unpack_from
+        chunks, systems, prns, counts = [], [], [], []
+        index = RawSatelliteDataPacket.HEAD_LENGTH
+        for _ in range(number_of_satellites):
+            satellite_system, prn, _, _, count = unpack_satellite(data, index)
+            index += SatelliteData.MINIMUM_LENGTH
+            end = index + count * FrequencyInformation.LENGTH
+            chunks.append(data[index:end])
+            systems.append(satellite_system)
+            prns.append(prn)
+            counts.append(count)
+            index = end
+
+        frequencies = np.frombuffer(b"".join(chunks), dtype=FREQUENCY_DTYPE)
+        rows = np.empty(len(frequencies), dtype=OBSERVATION_DTYPE)
+        rows["prn"] = np.repeat(prns, counts)
+        for name in FREQUENCY_DTYPE.names:
+            rows[name] = frequencies[name]
+        return np.repeat(np.array(systems, dtype="u1"), counts), rows
+
+    def store_epoch(self, key: Tuple[int, int], parts: list):
+        if len(parts) == 1:
+            systems, rows = parts[0]
+        else:
+            systems = np.concatenate([systems for systems, _ in parts])
+            rows = np.concatenate([rows for _, rows in parts])
+        rows["time"], rows["receiver_number"] = key
+
+        for satellite_system in np.unique(systems):
+            self.system_columns(SatelliteSystem(satellite_system)).append(
+                rows[systems == satellite_system]
+            )
+
+        if self.epoch_count == len(self.epoch_times):
+            self.epoch_times = np.resize(self.epoch_times, 2 * self.epoch_count)
+        self.epoch_times[self.epoch_count] = key[0]
+        self.epoch_count += 1
+
+    def system_columns(self, satellite_system: SatelliteSystem) -> ObservationColumns:
+        columns = self.columns.get(satellite_system)
+        if columns is None:
+            columns = ObservationColumns(self.capacity)
+            self.columns[satellite_system] = columns
+        return columns
+
+    def epochs(self) -> np.ndarray:
+        """Returns the times of all stored epochs"""
+        return self.epoch_times[: self.epoch_count]
+
+    def observations(self, satellite_system: SatelliteSystem) -> np.ndarray:
+        """Returns every stored observation of a satellite system as a view of
+        the store, one row per epoch, PRN and frequency"""
+        columns = self.columns.get(satellite_system)
+        if columns is None:
+            return np.empty(0, dtype=OBSERVATION_DTYPE)
+        return columns.view()
+
+    def epoch(self, satellite_system: SatelliteSystem, time: int) -> np.ndarray:
+        """Returns a copy of the observations of a satellite system at an epoch
+        time. Rows are matched on time, as they are not kept sorted by it."""
+        rows = self.observations(satellite_system)
+        return rows[rows["time"] == time]
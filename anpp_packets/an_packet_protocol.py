@@ -27,9 +27,11 @@
 # DEALINGS IN THE SOFTWARE.                                                    #
 ################################################################################
 from dataclasses import dataclass, field
-from typing import Final
+from functools import lru_cache
+from typing import Dict, Final, List, Tuple
 from array import array
-from struct import pack
+from binascii import crc_hqx
+from time import perf_counter_ns
 import struct
 from fastcrc import crc16
 
@@ -38,6 +40,15 @@ from anpp_packets.an_packets import PacketID
 AN_PACKET_HEADER_SIZE = 5
 AN_MAXIMUM_PACKET_SIZE = 255
 AN_DECODE_BUFFER_SIZE = 8 * (AN_MAXIMUM_PACKET_SIZE + AN_PACKET_HEADER_SIZE)
+AN_RESYNC_CHUNK_SIZE = 4096
+AN_ENCODE_CACHE_SIZE = 256
+
+# Lookup table mapping every byte value to 1 if it is an accepted packet ID and
+# to 0 otherwise. Used with bytearray.translate to find candidate headers.
+packet_id_table: Final = bytes(
+    1 if (value in PacketID._value2member_map_ or value == 82) else 0
+    for value in range(256)
+)
 
 
 # fmt: off
@@ -89,7 +100,108 @@ def calculate_crc16(data: bytes):
     return crc16.ibm_3740(bytes(data))
 
 
-@dataclass()
+def calculate_crc16_span(buffer: bytearray, start: int, end: int) -> int:
+    """Returns crc16 value of buffer[start:end] without copying the span.
+    binascii.crc_hqx computes the same CRC-16/IBM-3740 as calculate_crc16 but
+    reads any buffer object directly."""
+    with memoryview(buffer) as view:
+        return crc_hqx(view[start:end], 0xFFFF)
+
+
+class BitField:
+    """Descriptor for a flag inside the integer status word stored in the value
+    field of a flag class. The flag is only decoded from the word when it is
+    read and setting it updates the word, so unpacking a status word is a
+    single assignment. Fields wider than one bit are converted with type_,
+    for example to an Enum."""
+
+    __slots__ = ("bit", "mask", "type", "name")
+
+    def __init__(self, bit: int, width: int = 1, type_=bool):
+        self.bit = bit
+        self.mask = (1 << width) - 1
+        self.type = type_
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return self.type((instance.value >> self.bit) & self.mask)
+
+    def __set__(self, instance, flag):
+        flag = int(getattr(flag, "value", flag)) & self.mask
+        instance.value = (instance.value & ~(self.mask << self.bit)) | (
+            flag << self.bit
+        )
+
+    def extract(self, words):
+        """Extracts this flag from every status word in an array, such as a
+        status column of a structured NumPy array. Returns a boolean array for
+        single bit flags and the raw field values for wider fields."""
+        values = (words >> self.bit) & self.mask
+        return values != 0 if self.type is bool else values
+
+
+class FlagWord:
+    """Base of the flag classes, which store their status word in a value
+    field and expose each flag through a BitField. Flags can still be given
+    as keywords, or positionally in bit order, as when every flag was its
+    own field. The word itself is given as value=.
+
+    >>> from anpp_packets.an_packet_29 import RawGNSSFlags
+    >>> flags = RawGNSSFlags(fix_type=2, time_valid=True)
+    >>> flags.pack()
+    18
+    >>> decoded = RawGNSSFlags()
+    >>> decoded.unpack(flags.pack())
+    >>> decoded == flags, decoded.time_valid, decoded.fix_type
+    (True, True, 2)
+    >>> RawGNSSFlags(2, False, True) == flags
+    True
+    """
+
+    __slots__ = ()
+
+    def __init__(self, *flags, value: int = 0, **named_flags):
+        self.value = value
+        names = flag_names(type(self))
+        if len(flags) > len(names):
+            raise TypeError(
+                f"{type(self).__name__}() takes at most {len(names)} flags"
+            )
+        named_flags.update(zip(names, flags))
+        for name, flag in named_flags.items():
+            if name not in names:
+                raise TypeError(
+                    f"{type(self).__name__}() got an unexpected keyword argument"
+                    f" {name!r}"
+                )
+            setattr(self, name, flag)
+
+
+@lru_cache(maxsize=None)
+def flag_names(flag_class: type) -> Tuple[str, ...]:
+    """Returns the names of the BitFields of a flag class in bit order"""
+    return tuple(
+        name for name, value in vars(flag_class).items() if isinstance(value, BitField)
+    )
+
+
+@lru_cache(maxsize=None)
+def defined_bits(flag_class: type) -> int:
+    """Returns the mask of every bit covered by the BitFields of a flag class.
+    pack() applies it so reserved bits of a decoded word are not sent back."""
+    mask = 0
+    for value in vars(flag_class).values():
+        if isinstance(value, BitField):
+            mask |= value.mask << value.bit
+    return mask
+
+
+@dataclass(slots=True)
 class ANPacket:
     """Class containing Advanced Navigation Packet Protocol packet structure"""
 
@@ -106,95 +218,378 @@ class ANPacket:
         self.length = length_ & 0xFF
         self.data = data_
 
-        crc = pack("<H", calculate_crc16(self.data))
-        lrc = calculate_header_lrc(bytes([self.id.value, self.length, crc[0], crc[1]]))
+        crc = calculate_crc16(self.data)
+        crc_low, crc_high = crc & 0xFF, crc >> 8
+        lrc = calculate_header_lrc((self.id.value, self.length, crc_low, crc_high))
 
         self.header = self._structure.pack(
-            lrc, self.id.value, self.length, crc[0], crc[1]
+            lrc, self.id.value, self.length, crc_low, crc_high
         )
 
     def bytes(self):
         """Returns the packet as byte array"""
-        return self.header + self.data
+        return bytes(self.header) + bytes(self.data)
+
+
+@lru_cache(maxsize=AN_ENCODE_CACHE_SIZE)
+def encode_packet_bytes(id_: PacketID, data: bytes) -> bytes:
+    """Returns the complete encoded packet, header followed by data, for a
+    packet ID and payload. Results are cached by payload, so repeated sends
+    such as polling requests or periodic configuration reuse one frozen byte
+    string instead of recomputing the CRC, LRC and header each time."""
+    an_packet = ANPacket()
+    an_packet.encode(id_, len(data), data)
+    return an_packet.bytes()
+
+
+@dataclass(frozen=True, slots=True)
+class DecodedANPacket:
+    """Immutable ANPP packet returned by ANDecoder. Every decoded packet is a
+    new object, so it is never overwritten by a later decode."""
+
+    id: int
+    length: int
+    header: bytes
+    data: bytes
+
+    def bytes(self):
+        """Returns the packet as byte array"""
+        return bytes(self.header) + bytes(self.data)
+
+
+@dataclass(frozen=True, slots=True)
+class DecoderStatistics:
+    """Snapshot of the ANDecoder counters"""
+
+    bytes_received: int = 0
+    bytes_consumed: int = 0  # Bytes of valid packets, decoded or skipped
+    bytes_discarded: int = 0  # Bytes skipped while resynchronising
+    backlog: int = 0  # Bytes received but not decoded yet
+    backlog_high_water: int = 0
+    overflow_bytes: int = 0
+    compactions: int = 0
+    crc_errors: int = 0
+    skipped_packets: int = 0
+    packets_decoded: int = 0
+    packets_per_id: Dict[int, int] = field(default_factory=dict)
+    # Time spent in every decode call, including resynchronising and calls
+    # that find no complete packet, per decoded packet
+    average_decode_time_us: float = 0
 
 
 class ANDecoder:
     BUFFER_STREAM_LIMIT: int = 10 * 1024 * 1024     # 10MB limit to check when adding/streaming data where we resize the buffer 
     DECODER_ITERATOR_LIMIT: int = 10 * 1024 * 1024  # 10MB limit for when we resize the buffer after decoding that amount of data
-    
-    decode_iterator: int = 0
-    buffer: bytearray = bytearray()
-    mem_view: memoryview
-    crc_errors: int = 0
-    an_packet: ANPacket = ANPacket()
-    
+
+    def __init__(self, capacity: int = 0, zero_copy: bool = False):
+        """A capacity of 0 keeps the growing buffer. Any other capacity
+        preallocates a fixed buffer of that many bytes which is reused for the
+        lifetime of the decoder, so memory stays flat on long running loggers.
+
+        With zero_copy the decoded packet header and data are memoryviews into
+        the fixed buffer instead of bytes copies. They are only valid until the
+        decoder next moves data in its buffer, which happens when new data is
+        added, so copy anything that has to outlive the current batch.
+
+        All decoder state belongs to the instance, so decoders for several
+        devices can run side by side in different threads."""
+        if capacity and capacity < AN_DECODE_BUFFER_SIZE:
+            raise ValueError(
+                f"Capacity:{capacity} is smaller than {AN_DECODE_BUFFER_SIZE}"
+            )
+        if zero_copy and not capacity:
+            raise ValueError("Zero copy decoding requires a fixed capacity")
+
+        self.decode_iterator: int = 0
+        self.buffer: bytearray = bytearray(capacity)
+        self.buffer_end: int = 0  # End of the valid data in the buffer
+        self.capacity: int = capacity  # Fixed buffer size, 0 for a growing buffer
+        self.overflow_bytes: int = 0  # Undecoded bytes dropped from a full buffer
+        self.zero_copy: bool = zero_copy
+        self.mem_view: memoryview = memoryview(self.buffer) if zero_copy else None
+        self.crc_errors: int = 0
+        self.skipped_packets: int = 0  # Valid packets skipped by the subscription
+        self.subscription: bytes = None  # Packet ID lookup table, None for all
+        self.synced_end: int = -1  # End of the last packet verified in sequence
+        self.verified_lengths: bytearray = bytearray(256)  # Per ID, 0 if unknown
+
+        # Statistics counters, see statistics()
+        self.bytes_received: int = 0
+        self.bytes_consumed: int = 0
+        self.bytes_discarded: int = 0
+        self.backlog_high_water: int = 0
+        self.compactions: int = 0
+        self.packet_counts: List[int] = [0] * 256
+        self.decode_time_ns: int = 0
+
+    def subscribe(self, packet_ids=None):
+        """Only decode packets with the given packet IDs. Packets with any other
+        ID are skipped by their length without a CRC check or copy while the
+        decoder is in sync: the packet starts where the previous verified
+        packet ended, its length is the length last verified for its ID and
+        the header that follows it is valid. Any other packet is CRC checked.
+        Passing None decodes every packet."""
+        if packet_ids is None:
+            self.subscription = None
+        else:
+            packet_ids = {int(packet_id) for packet_id in packet_ids}
+            self.subscription = bytes(
+                1 if value in packet_ids else 0 for value in range(256)
+            )
+
     def add_data(self, packet_bytes: bytes):
-        packet_bytes = bytearray(packet_bytes)
         """Add data bytes to the buffer"""
+        if self.capacity:
+            length = len(packet_bytes)
+            if length > self.capacity:
+                self.overflow_bytes += length - self.capacity
+                packet_bytes = packet_bytes[-self.capacity :]
+                length = self.capacity
+            self.reserve(length)
+            self.buffer[self.buffer_end : self.buffer_end + length] = packet_bytes
+            self.buffer_end += length
+            self.track_received(length)
+            return
+
+        packet_bytes = bytearray(packet_bytes)
         if self.buffer is None or len(self.buffer) == 0:
             self.buffer = packet_bytes
         else:
             self.buffer.extend(packet_bytes)
-            
+        self.buffer_end = len(self.buffer)
+        self.track_received(len(packet_bytes))
+
         if len(self.buffer) > self.BUFFER_STREAM_LIMIT:
             self.remove_processed_data()
-            
+
+    def add_data_from(self, stream, size: int) -> int:
+        """Reads up to size bytes from a stream supporting readinto, such as a
+        serial port or socket file, directly into the fixed buffer. Returns the
+        number of bytes read, which are the last count bytes of the buffer.
+
+        A fixed buffer is only filled up to its free tail, so a short read
+        never costs undecoded data. Decoded data is dropped when the tail is
+        full, and the oldest undecoded data only if nothing was decoded."""
+        if not self.capacity:
+            data = stream.read(size)
+            self.add_data(data)
+            return len(data)
+
+        size = min(size, self.capacity)
+        if self.buffer_end == self.capacity:
+            self.remove_processed_data()
+            if self.buffer_end == self.capacity:
+                self.reserve(size)
+        size = min(size, self.capacity - self.buffer_end)
+        count = stream.readinto(
+            memoryview(self.buffer)[self.buffer_end : self.buffer_end + size]
+        )
+        self.buffer_end += count or 0
+        self.track_received(count or 0)
+        return count or 0
+
+    def track_received(self, count: int):
+        """Updates the received byte count and the backlog high water mark"""
+        self.bytes_received += count
+        backlog = self.buffer_end - self.decode_iterator
+        if backlog > self.backlog_high_water:
+            self.backlog_high_water = backlog
+
+    def reserve(self, size: int):
+        """Makes room for size bytes at the end of the fixed buffer. Decoded data
+        is dropped first, then the oldest undecoded data if it is still full."""
+        if (self.buffer_end + size) <= self.capacity:
+            return
+        self.remove_processed_data()
+        excess = self.buffer_end + size - self.capacity
+        if excess > 0:
+            self.overflow_bytes += excess
+            self.decode_iterator = excess
+            self.remove_processed_data()
+
     def remove_processed_data(self):
         if self.decode_iterator > 0:
-            self.buffer = self.buffer[self.decode_iterator:]
+            self.synced_end -= self.decode_iterator
+            if self.capacity:
+                remaining = self.buffer_end - self.decode_iterator
+                self.buffer[:remaining] = self.buffer[
+                    self.decode_iterator : self.buffer_end
+                ]
+                self.buffer_end = remaining
+            else:
+                self.buffer = self.buffer[self.decode_iterator:]
+                self.buffer_end = len(self.buffer)
             self.decode_iterator = 0
+            self.compactions += 1
+
+    def statistics(self) -> DecoderStatistics:
+        """Returns a snapshot of the decoder counters. Cheap enough to call from
+        a logging loop every few seconds."""
+        packets_decoded = sum(self.packet_counts)
+        return DecoderStatistics(
+            bytes_received=self.bytes_received,
+            bytes_consumed=self.bytes_consumed,
+            bytes_discarded=self.bytes_discarded,
+            backlog=self.buffer_end - self.decode_iterator,
+            backlog_high_water=self.backlog_high_water,
+            overflow_bytes=self.overflow_bytes,
+            compactions=self.compactions,
+            crc_errors=self.crc_errors,
+            skipped_packets=self.skipped_packets,
+            packets_decoded=packets_decoded,
+            packets_per_id={
+                packet_id: count
+                for packet_id, count in enumerate(self.packet_counts)
+                if count
+            },
+            average_decode_time_us=(
+                self.decode_time_ns / packets_decoded / 1000
+                if packets_decoded
+                else 0
+            ),
+        )
+
+    def header_is_valid(self, index: int) -> bool:
+        """Returns True if the five bytes at index carry an accepted packet ID
+        and a valid header LRC, in which case all five bytes sum to zero"""
+        buffer = self.buffer
+        return packet_id_table[buffer[index + 1]] and (
+            buffer[index]
+            + buffer[index + 1]
+            + buffer[index + 2]
+            + buffer[index + 3]
+            + buffer[index + 4]
+        ) & 0xFF == 0
+
+    def next_candidate_header(self, start: int, buffer_length: int) -> int:
+        """Returns the first position at or after start holding a valid header,
+        or the position of a header that is not complete yet. Packet ID bytes
+        are located a chunk at a time with a translate lookup so that only
+        positions with an accepted ID are LRC checked."""
+        while (start + AN_PACKET_HEADER_SIZE) <= buffer_length:
+            end = min(start + 1 + AN_RESYNC_CHUNK_SIZE, buffer_length)
+            id_mask = self.buffer[start + 1 : end].translate(packet_id_table)
+            found = id_mask.find(1)
+            while found >= 0:
+                index = start + found
+                if (index + AN_PACKET_HEADER_SIZE) > buffer_length:
+                    return index
+                if self.header_is_valid(index):
+                    return index
+                found = id_mask.find(1, found + 1)
+            start = end - 1
+        return start
 
     def decode(self):
         """Takes binary data byte array consisting of ANPP packets. Returns tuple
         consisting of first ANPP packet found and inputted byte array with the first
         ANPP packet returned and data before this packet, removed."""
-        buffer_length = len(self.buffer)
+        start_time = perf_counter_ns()
+        an_packet = self.next_packet()
+        self.decode_time_ns += perf_counter_ns() - start_time
+        return an_packet
+
+    def next_packet(self):
+        """Returns the next complete packet in the buffer, or None, for decode"""
+        buffer = self.buffer
+        buffer_length = self.buffer_end
 
         while (self.decode_iterator + AN_PACKET_HEADER_SIZE) <= buffer_length:
-            header_lrc = self.buffer[self.decode_iterator]
-            header_data = self.buffer[
-                self.decode_iterator + 1 : self.decode_iterator + AN_PACKET_HEADER_SIZE
-            ]
+            index = self.decode_iterator
 
-            if header_lrc == calculate_header_lrc(header_data):
-                length = header_data[1]
+            if not self.header_is_valid(index):
+                # Resynchronise on the next position that can hold a header
+                self.decode_iterator = self.next_candidate_header(
+                    index + 1, buffer_length
+                )
+                self.bytes_discarded += self.decode_iterator - index
+                continue
 
-                data_start = self.decode_iterator + AN_PACKET_HEADER_SIZE
-                data_end = data_start + length
+            length = buffer[index + 2]
 
-                if data_end > buffer_length:
+            data_start = index + AN_PACKET_HEADER_SIZE
+            data_end = data_start + length
+
+            if data_end > buffer_length:
+                return None
+
+            packet_id = buffer[index + 1]
+            subscribed = self.subscription is None or self.subscription[packet_id]
+            if (
+                not subscribed
+                and index == self.synced_end
+                and length
+                and length == self.verified_lengths[packet_id]
+            ):
+                # Trust the length of an unwanted packet in sync when the next
+                # header lines up behind it, otherwise fall back to the CRC
+                if (data_end + AN_PACKET_HEADER_SIZE) > buffer_length:
                     return None
+                if self.header_is_valid(data_end):
+                    self.skipped_packets += 1
+                    self.bytes_consumed += data_end - index
+                    self.decode_iterator = data_end
+                    self.synced_end = data_end
+                    continue
 
-                crc = header_data[2] | (header_data[3] << 8)
+            crc = buffer[index + 3] | (buffer[index + 4] << 8)
 
-                if crc == calculate_crc16(self.buffer[data_start:data_end]):
-                    if (
-                        header_data[0] not in PacketID._value2member_map_
-                        and header_data[0] != 82
-                    ):
-                        self.decode_iterator += 1
-                        continue
+            if crc == calculate_crc16_span(buffer, data_start, data_end):
+                self.synced_end = data_end
+                self.verified_lengths[packet_id] = length
+                if not subscribed:
+                    self.skipped_packets += 1
+                    self.bytes_consumed += data_end - index
+                    self.decode_iterator = data_end
+                    continue
 
-                    self.an_packet.id = int(header_data[0])
-                    self.an_packet.length = length
-                    self.an_packet.header = bytes(
-                        self.buffer[self.decode_iterator : data_start]
+                if self.zero_copy:
+                    an_packet = DecodedANPacket(
+                        buffer[index + 1],
+                        length,
+                        self.mem_view[index:data_start],
+                        self.mem_view[data_start:data_end],
                     )
-                    self.an_packet.data = bytes(self.buffer[data_start:data_end])
-
-                    self.decode_iterator += (
-                        AN_PACKET_HEADER_SIZE + self.an_packet.length
+                else:
+                    an_packet = DecodedANPacket(
+                        buffer[index + 1],
+                        length,
+                        bytes(buffer[index:data_start]),
+                        bytes(buffer[data_start:data_end]),
                     )
-                    if self.decode_iterator > self.DECODER_ITERATOR_LIMIT:
-                        self.remove_processed_data()
 
-                    return self.an_packet
-                else:
-                    self.crc_errors += 1
+                self.decode_iterator = data_end
+                # A fixed buffer is only compacted when new data is added, so
+                # zero copy packets of the current batch stay valid
+                if (
+                    not self.capacity
+                    and self.decode_iterator > self.DECODER_ITERATOR_LIMIT
+                ):
+                    self.remove_processed_data()
+
+                self.bytes_consumed += data_end - index
+                self.packet_counts[an_packet.id] += 1
+                return an_packet
+            else:
+                self.crc_errors += 1
             self.decode_iterator += 1
+            self.bytes_discarded += 1
 
         if self.decode_iterator > buffer_length:
-            self.buffer = bytearray()
+            if not self.capacity:
+                self.buffer = bytearray()
+            self.buffer_end = 0
             self.decode_iterator = 0
+            self.synced_end = -1
 
         return None
+
+    def iter_decode(self):
+        """Generator yielding every complete ANPP packet found in the buffer"""
+        while (an_packet := self.decode()) is not None:
+            yield an_packet
+
+    def decode_all(self):
+        """Drains the buffer in a single pass. Returns a list of every complete
+        ANPP packet found, which is empty if no complete packet is available."""
+        return list(self.iter_decode())
@@ -1,63 +1,195 @@
-from picamera2 import Picamera2
+from picamera2 import Picamera2, MappedArray
 import time
 import os
+import queue
+import threading
 from datetime import datetime
-import csv
 import cv2
+import numpy as np
+from log_writer import CSVLayout, iso_timestamp, open_log
+from session_store import new_session_id, session_folder
+
+FRAME_POOL_SIZE = 4          # Preallocated frame buffers shared by capture and encoding
+ENCODE_THREADS = 2           # Threads encoding and writing JPEGs
+JPEG_QUALITY = 85            # JPEG quality of saved images
+STATISTICS_INTERVAL = 10.0   # Seconds between frame rate and drop count printouts
+
+_STOP = object()  # Queued by close to stop an encoder thread
+
+# Columns of the camera log, see log_writer.open_log
+CAMERA_LOG_COLUMNS = [
+    ("timestamp_ns", "int64"),
+    ("filename", str),
+]
+
+# Camera log row in the CSV layout, with an ISO timestamp
+def camera_csv_row(row):
+    timestamp_ns, filename = row
+    return [iso_timestamp(timestamp_ns), filename]
+
+CAMERA_CSV_LAYOUT = CSVLayout("Cam_data.csv", ["timestamp", "filename"], camera_csv_row)
+
+# Encodes and writes captured frames in background threads, so the capture
+# cadence is not bound by JPEG encoding and USB write time. Frames are copied
+# into a pool of preallocated buffers and a buffer returns to the pool once its
+# JPEG is written. When every buffer is still waiting to be encoded, acquire
+# returns None and the new frame is dropped, so capture never waits. OpenCV
+# releases the GIL while encoding, so the threads encode in parallel. Frames
+# can finish out of order, their log rows are still written in capture order.
+class JpegEncoderPool:
+    def __init__(self, frame_shape, writer, pool_size=FRAME_POOL_SIZE,
+                 threads=ENCODE_THREADS, quality=JPEG_QUALITY):
+        self.frames = [np.empty(frame_shape, dtype=np.uint8) for _ in range(pool_size)]
+        self.free = queue.Queue()
+        for index in range(pool_size):
+            self.free.put(index)
+        self.pending = queue.Queue()
+        self.params = [int(cv2.IMWRITE_JPEG_QUALITY), quality]
+
+        # The log writer is not thread safe, rows are written under the lock
+        self.writer = writer
+        self.lock = threading.Lock()
+        self.submitted = 0   # Sequence number of the next submitted frame
+        self.logged = 0      # Sequence number of the next frame to log
+        self.finished = {}   # Log rows of frames finished out of order, None if failed
+
+        self.captured = 0  # Frames handed to the encoders
+        self.dropped = 0   # Frames dropped because no buffer was free
+        self.saved = 0     # JPEGs written and logged
+        self.failed = 0    # JPEGs that could not be written
+
+        self.threads = [
+            threading.Thread(target=self.run, name=f"jpeg-encoder-{n}", daemon=True)
+            for n in range(threads)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def acquire(self):
+        """Returns the index of a free frame buffer, or None when the frame is dropped"""
+        try:
+            return self.free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return None
+
+    def submit(self, index, timestamp_ns, filename):
+        """Queues the frame in buffer index to be encoded and written to filename"""
+        self.captured += 1
+        self.pending.put((self.submitted, index, timestamp_ns, filename))
+        self.submitted += 1
+
+    def run(self):
+        while True:
+            item = self.pending.get()
+            if item is _STOP:
+                return
+            sequence, index, timestamp_ns, filename = item
+            try:
+                saved = cv2.imwrite(filename, self.frames[index], self.params)
+            except cv2.error as e:
+                print(f"[Camera] Encoding {filename} failed: {e}")
+                saved = False
+            finally:
+                self.free.put(index)
+
+            with self.lock:
+                self.finished[sequence] = (
+                    [timestamp_ns, os.path.basename(filename)] if saved else None
+                )
+                # Log every frame finished in sequence, so rows stay in time order
+                while self.logged in self.finished:
+                    row = self.finished.pop(self.logged)
+                    self.logged += 1
+                    if row is not None:
+                        self.writer.writerow(row)
+                        self.saved += 1
+                    else:
+                        self.failed += 1
+
+    def close(self):
+        """Encodes every queued frame and stops the threads"""
+        for _ in self.threads:
+            self.pending.put(_STOP)
+        for thread in self.threads:
+            thread.join()
+
+    def statistics(self):
+        return f"captured={self.captured} saved={self.saved} dropped={self.dropped} failed={self.failed}"
 
 # Main camera logging function
-def run_camera(start_event, start_time, interval, max_duration, shutdown_event):
-    # Create folder structure for image storage
-    base_folder = "/media/bird/LOGGER1/Images"
-    session_folder = os.path.join(base_folder, datetime.now().strftime("%Y%m%d_%H%M%S"))
-    os.makedirs(session_folder, exist_ok=True)  # Create session folder if not existing
-    log_path = os.path.join(session_folder, "Cam_data.csv")  # Path to CSV log file
+def run_camera(start_event, start_time, interval, max_duration, shutdown_event, session_id=None):
+    # Images are stored in the session folder shared by all workers
+    session_id = session_id or new_session_id()
+    folder = session_folder(session_id)
+    image_folder = os.path.join(folder, "images")
+    os.makedirs(image_folder, exist_ok=True)  # Create image folder if not existing
 
     # Initialize PiCamera2 and configure it
     picam = Picamera2()
     config = picam.create_still_configuration(main={"format": "RGB888"})  # Set image format
     picam.configure(config)
     picam.start()
+    width, height = config["main"]["size"]
     print("[Camera] Initialized. Waiting to start...")
 
     try:
-        # Open CSV file for logging
-        with open(log_path, mode="w", newline="") as log_file:
-            writer = csv.writer(log_file)
-            writer.writerow(["timestamp", "filename"])  # Write header row to CSV
-
-            # Wait until external start signal is received
-            start_event.wait()
-            base_time = start_time.value
-            print(f"[Camera] Started at: {time.ctime(base_time)}")
-
-            last_capture = 0.0  # Initialize last capture timestamp
-
-            while not shutdown_event.is_set():
-                now = time.time()
-
-                # Check if maximum recording duration has been reached
-                if max_duration.value > 0 and now - base_time >= max_duration.value:
-                    print("[Camera] Max duration reached.")
-                    break
-
-                # Capture image at specified interval
-                if (now - last_capture) >= interval.value:
-                    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')  # Generate timestamp for filename
-                    filename = f"{session_folder}/{timestamp}.jpg"  # Full path for image file
-                    image = picam.capture_array()  # Capture image frame
-
-                    # Compress and save image as JPEG (85% quality)
-                    cv2.imwrite(filename, image, [int(cv2.IMWRITE_JPEG_QUALITY), 85])
-
-                    # Log image capture with timestamp and filename
-                    writer.writerow([datetime.now().isoformat(), os.path.basename(filename)])
-                    log_file.flush()  # Immediately write data to file
-                    print(f"[Camera] Saved and logged: {filename}")
-                    last_capture = now  # Update last capture timestamp
-
-                time.sleep(0.01)  # Short sleep to reduce CPU usage
+        # Open the log in LOG_FORMAT, see log_writer.open_log for how rows reach disk
+        with open_log(folder, "camera", CAMERA_LOG_COLUMNS,
+                      metadata={"session": session_id},
+                      csv_layout=CAMERA_CSV_LAYOUT) as writer:
+            encoder = JpegEncoderPool((height, width, 3), writer)
+
+            try:
+                # Wait until external start signal is received
+                start_event.wait()
+                base_time = start_time.value
+                print(f"[Camera] Started at: {time.ctime(base_time)}")
+
+                last_capture = 0.0  # Initialize last capture timestamp
+                last_statistics = time.time()
+                last_saved = 0
+
+                while not shutdown_event.is_set():
+                    now = time.time()
+
+                    # Check if maximum recording duration has been reached
+                    if max_duration.value > 0 and now - base_time >= max_duration.value:
+                        print("[Camera] Max duration reached.")
+                        break
+
+                    # Report the achieved frame rate and dropped frames
+                    if now - last_statistics >= STATISTICS_INTERVAL:
+                        frame_rate = (encoder.saved - last_saved) / (now - last_statistics)
+                        print(f"[Camera] {frame_rate:.1f} fps, {encoder.statistics()}")
+                        last_saved = encoder.saved
+                        last_statistics = now
+
+                    # Capture image at specified interval
+                    if (now - last_capture) >= interval.value:
+                        last_capture = now  # Update last capture timestamp
+
+                        # Drop the frame while every buffer waits to be encoded
+                        index = encoder.acquire()
+                        if index is not None:
+                            # Copy the frame into the pool and hand the camera buffer back
+                            request = picam.capture_request()
+                            try:
+                                with MappedArray(request, "main") as mapped:
+                                    np.copyto(encoder.frames[index], mapped.array[:height, :width])
+                            finally:
+                                request.release()
+
+                            timestamp_ns = time.time_ns()
+                            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')[:-3]  # Generate timestamp for filename
+                            encoder.submit(index, timestamp_ns, f"{image_folder}/{timestamp}.jpg")
+
+                    time.sleep(0.01)  # Short sleep to reduce CPU usage
+            finally:
+                # Encode the queued frames before the log is closed
+                encoder.close()
+                print(f"[Camera] {encoder.statistics()}")
     finally:
         # Stop camera when finished
         picam.stop()
-        print(f"[Camera] Data saved to {session_folder}")
+        print(f"[Camera] Data saved to {folder}")
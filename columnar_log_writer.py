@@ -0,0 +1,117 @@
+import os
+import time
+import numpy as np
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+ROW_GROUP_SIZE = 1000        # Rows buffered before a row group is written...
+ROW_GROUP_INTERVAL = 10.0    # ...or once the oldest buffered row is this many seconds old
+COMPRESSION = "zstd"
+
+
+# Columnar log writer. Rows are buffered into typed NumPy arrays, one per column,
+# and written as compressed row groups, so nothing is formatted as text per row.
+# Columns are given as (name, type) pairs, with a NumPy type such as "int64" or
+# "float32", or str for text. The schema carries the stream name and any session
+# metadata, so every file of a session describes itself.
+#
+# format "arrow" writes an Arrow IPC stream, which stays readable up to the last
+# complete row group if power is lost. format "parquet" writes a Parquet file,
+# which is smaller but only readable once closed. Each row group is synced to
+# disk, so row_group_size and row_group_interval set the power loss exposure.
+class ColumnarLogWriter:
+    def __init__(self, path, columns, format="arrow", metadata=None,
+                 row_group_size=ROW_GROUP_SIZE, row_group_interval=ROW_GROUP_INTERVAL,
+                 compression=COMPRESSION):
+        self.path = path
+        self.names = [name for name, _ in columns]
+        self.row_group_size = row_group_size
+        self.row_group_interval = row_group_interval
+        self.rows_written = 0
+        self.row_groups = 0
+
+        fields = []
+        self.buffers = []
+        for name, type_ in columns:
+            if type_ is str:
+                fields.append(pa.field(name, pa.string()))
+                self.buffers.append(np.empty(row_group_size, dtype=object))
+            else:
+                dtype = np.dtype(type_)
+                fields.append(pa.field(name, pa.from_numpy_dtype(dtype)))
+                self.buffers.append(np.empty(row_group_size, dtype=dtype))
+        self.schema = pa.schema(
+            fields, metadata={key: str(value) for key, value in (metadata or {}).items()}
+        )
+        self.count = 0
+        self.batch_start = 0.0
+
+        self.file = open(path, "wb")
+        if format == "arrow":
+            options = ipc.IpcWriteOptions(compression=compression)
+            self.writer = ipc.new_stream(self.file, self.schema, options=options)
+        elif format == "parquet":
+            self.writer = pq.ParquetWriter(self.file, self.schema, compression=compression)
+        else:
+            self.file.close()
+            raise ValueError(f"Format:{format} is not valid")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def writerow(self, row):
+        """Buffers a row of values in column order"""
+        index = self.count
+        for buffer, value in zip(self.buffers, row):
+            buffer[index] = value
+        if index == 0:
+            self.batch_start = time.monotonic()
+        self.count = index + 1
+
+        if (self.count == self.row_group_size
+                or time.monotonic() - self.batch_start >= self.row_group_interval):
+            self.write_row_group()
+
+    def write_columns(self, columns):
+        """Writes whole columns, one array per column, as a single row group
+        after the buffered rows"""
+        self.write_row_group()
+        self.write_arrays(columns)
+
+    def write_row_group(self):
+        if not self.count:
+            return
+        self.write_arrays([buffer[:self.count] for buffer in self.buffers])
+        self.count = 0
+
+    def write_arrays(self, columns):
+        arrays = [
+            pa.array(column, type=field.type)
+            for column, field in zip(columns, self.schema)
+        ]
+        table = pa.Table.from_arrays(arrays, schema=self.schema)
+        self.writer.write_table(table)
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.rows_written += table.num_rows
+        self.row_groups += 1
+
+    def close(self):
+        """Writes the buffered rows and closes the file"""
+        if self.file.closed:
+            return
+        self.write_row_group()
+        self.writer.close()
+        self.file.close()
+
+
+# Read a log written by ColumnarLogWriter into an Arrow table
+def read_columnar_log(path):
+    if path.endswith(".parquet"):
+        return pq.read_table(path)
+    with pa.memory_map(path) as source:
+        return ipc.open_stream(source).read_all()
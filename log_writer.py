@@ -0,0 +1,168 @@
+import csv
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+LOG_QUEUE_SIZE = 10000       # Rows held in memory before writerow blocks
+COMMIT_ROWS = 100            # Commit after this many rows...
+COMMIT_INTERVAL_MS = 1000    # ...or once the oldest uncommitted row is this old
+LOG_FORMAT = "csv"           # "csv", "arrow", "parquet" or "session", see open_log
+
+_CLOSE = object()  # Queued by close to stop the writer thread
+
+
+# CSV writer shared by the workers. Rows are queued in memory and written by a
+# background thread, which commits them to disk in groups: after commit_rows
+# rows or once the oldest uncommitted row is commit_interval_ms old, whichever
+# comes first. A commit flushes the file and, with fsync set, syncs it to the
+# storage device. On power loss at most the queued rows and one group are lost,
+# so commit_rows and commit_interval_ms set the exposure explicitly. Setting
+# either to None disables that trigger. With convert, every queued row is
+# passed through it in the writer thread before it is written, so formatting
+# stays off the caller. close drains the queue and commits every remaining row,
+# call it when the worker stops on shutdown_event.
+class GroupCommitCSVWriter:
+    def __init__(self, path, header=None, commit_rows=COMMIT_ROWS,
+                 commit_interval_ms=COMMIT_INTERVAL_MS, queue_size=LOG_QUEUE_SIZE,
+                 fsync=True, convert=None):
+        if commit_rows is None and commit_interval_ms is None:
+            raise ValueError("Set commit_rows, commit_interval_ms or both")
+
+        self.path = path
+        self.commit_rows = commit_rows
+        self.commit_interval = (
+            commit_interval_ms / 1000 if commit_interval_ms is not None else None
+        )
+        self.fsync = fsync
+        self.convert = convert
+        self.rows_written = 0
+        self.commits = 0
+        self.error = None
+
+        self.file = open(path, "w", newline="")
+        self.writer = csv.writer(self.file)
+        if header is not None:
+            self.writer.writerow(header)
+            self.commit()
+
+        self.rows = queue.Queue(queue_size)
+        self.thread = threading.Thread(target=self.run, name="log-writer", daemon=True)
+        self.thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def writerow(self, row):
+        """Queues a row, blocking only while the queue is full"""
+        if self.error is not None:
+            raise self.error
+        self.rows.put(row)
+
+    def commit(self):
+        self.file.flush()
+        if self.fsync:
+            os.fsync(self.file.fileno())
+        self.commits += 1
+
+    def run(self):
+        pending = 0
+        batch_start = 0.0  # Time the oldest uncommitted row was written
+        try:
+            while True:
+                timeout = None
+                if pending and self.commit_interval is not None:
+                    timeout = max(0.0, batch_start + self.commit_interval - time.monotonic())
+
+                try:
+                    row = self.rows.get(timeout=timeout)
+                except queue.Empty:
+                    row = None  # Commit interval elapsed
+
+                if row is _CLOSE:
+                    break
+                if row is not None:
+                    if self.convert is not None:
+                        row = self.convert(row)
+                    self.writer.writerow(row)
+                    self.rows_written += 1
+                    if not pending:
+                        batch_start = time.monotonic()
+                    pending += 1
+
+                if pending and (
+                    (self.commit_rows is not None and pending >= self.commit_rows)
+                    or (self.commit_interval is not None
+                        and time.monotonic() - batch_start >= self.commit_interval)
+                ):
+                    self.commit()
+                    pending = 0
+        except OSError as e:
+            print(f"[Log] Writing {self.path} failed: {e}")
+            self.error = e
+            # Keep emptying the queue so writers and close never block
+            while self.rows.get() is not _CLOSE:
+                pass
+            return
+
+        if pending:
+            self.commit()
+
+    def close(self):
+        """Drains the queue, commits every remaining row and closes the file"""
+        if self.file.closed:
+            return
+        self.rows.put(_CLOSE)
+        self.thread.join()
+        self.file.close()
+
+
+# How a stream is written as CSV: the file name, the header and a function
+# turning a typed row into the CSV row, so the CSV logs keep the files and
+# columns the workers wrote before the typed formats were added
+class CSVLayout:
+    def __init__(self, filename, header, convert=None):
+        self.filename = filename
+        self.header = header
+        self.convert = convert
+
+
+# ISO 8601 local time of a time.time_ns() timestamp, as datetime.isoformat
+def iso_timestamp(timestamp_ns, sep="T", timespec="auto"):
+    seconds, nanoseconds = divmod(timestamp_ns, 1_000_000_000)
+    timestamp = datetime.fromtimestamp(seconds).replace(microsecond=nanoseconds // 1000)
+    return timestamp.isoformat(sep=sep, timespec=timespec)
+
+
+# Open the log of one stream in LOG_FORMAT. columns lists (name, type) pairs,
+# rows are written as typed values in that order, timestamps as int64 ns from
+# time.time_ns(). "csv" writes the rows through the group-commit queue, in
+# csv_layout if given, otherwise as <name>.csv with the column names as header.
+# "arrow" and "parquet" write columnar files with the typed columns and need
+# pyarrow; without it the log falls back to CSV. "session" stores the log as a
+# memory-mapped stream of the session container, see session_store; rows are
+# written in the worker, not through the group-commit queue, and synced every
+# SESSION_SYNC_INTERVAL.
+def open_log(folder, name, columns, metadata=None, log_format=None, csv_layout=None):
+    log_format = log_format or LOG_FORMAT
+    if log_format == "session":
+        from session_store import SessionStreamWriter
+        return SessionStreamWriter(folder, name, columns, metadata=metadata)
+    if log_format != "csv":
+        try:
+            from columnar_log_writer import ColumnarLogWriter
+        except ImportError:
+            print(f"[Log] pyarrow is not installed, writing {name} as CSV")
+        else:
+            extension = ".arrow" if log_format == "arrow" else ".parquet"
+            metadata = {"stream": name, **(metadata or {})}
+            return ColumnarLogWriter(os.path.join(folder, name + extension), columns,
+                                     format=log_format, metadata=metadata)
+    if csv_layout is None:
+        csv_layout = CSVLayout(name + ".csv", [column for column, _ in columns])
+    return GroupCommitCSVWriter(os.path.join(folder, csv_layout.filename),
+                                csv_layout.header, convert=csv_layout.convert)
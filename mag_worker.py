@@ -1,29 +1,40 @@
 import time
-import csv
-import os
-from datetime import datetime
 import RPi.GPIO as GPIO
 import ads8688
+from log_writer import CSVLayout, iso_timestamp, open_log
+from session_store import new_session_id, session_folder
+
+# Columns of the ADC log, see log_writer.open_log
+ADC_LOG_COLUMNS = [
+    ("timestamp_ns", "int64"),
+    ("X", "float32"),
+    ("Y", "float32"),
+    ("Z", "float32"),
+]
+
+# ADC log row in the CSV layout, timestamped to the millisecond
+def adc_csv_row(row):
+    timestamp_ns, x, y, z = row
+    return [iso_timestamp(timestamp_ns, " ", "milliseconds"), x, y, z]
+
+ADC_CSV_LAYOUT = CSVLayout("adc_data.csv", ["Timestamp", "X", "Y", "Z"], adc_csv_row)
 
 GPIO.setwarnings(False)  # Disable GPIO warnings
 
 # Main ADC logging function
-def run_adc(start_event, start_time, interval, max_duration):
-    # Create folder structure for data storage
-    base_folder = "/media/bird/D0E44DDBE44DC506/mag"
-    folder = os.path.join(base_folder, datetime.now().strftime("%Y%m%d_%H%M%S"))
-    os.makedirs(folder, exist_ok=True)
-    filename = os.path.join(folder, "adc_data.csv")
+def run_adc(start_event, start_time, interval, max_duration, shutdown_event, session_id=None):
+    # Data is stored in the session folder shared by all workers
+    session_id = session_id or new_session_id()
+    folder = session_folder(session_id)
 
     # Initialize ADC with SPI settings
     adc = ads8688.ADS8688(bus=0, device=1, cs_pin=8, freq=100000)
     adc.reset()
     adc.setGlobalRange(ads8688.R0)
 
-    # Open CSV file for writing
-    with open(filename, "w", newline="") as file:
-        writer = csv.writer(file)
-        writer.writerow(["Timestamp", "X", "Y", "Z"])  # Write header row
+    # Open the log in LOG_FORMAT, see log_writer.open_log for how rows reach disk
+    with open_log(folder, "adc", ADC_LOG_COLUMNS,
+                  metadata={"session": session_id}, csv_layout=ADC_CSV_LAYOUT) as writer:
         print("[ADC] Initialized. Waiting for start...")
 
         # Wait for external start signal
@@ -31,7 +42,7 @@ def run_adc(start_event, start_time, interval, max_duration):
         base_time = start_time.value
         print(f"[ADC] Starting at: {time.ctime(base_time)}")
 
-        while True:
+        while not shutdown_event.is_set():
             now = time.time()
 
             # Check if maximum logging duration has been reached
@@ -40,7 +51,7 @@ def run_adc(start_event, start_time, interval, max_duration):
                 break
 
             # Get current timestamp
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+            timestamp_ns = time.time_ns()
 
             # Read X-axis (Bird coordinate: -Y, connected to Channel 1)
             adc.manualChannel(1)
@@ -54,12 +65,11 @@ def run_adc(start_event, start_time, interval, max_duration):
             adc.manualChannel(0)
             z = -adc.raw2volt(adc.noOp(), ads8688.R0) * 10000
 
-            # Write data to CSV and flush buffer
-            writer.writerow([timestamp, x, y, z])
-            file.flush()
+            # Queue data for the log
+            writer.writerow([timestamp_ns, x, y, z])
 
             # Print measurement to console
-            print(f"[ADC] {timestamp}: X={x}, Y={y}, Z={z}")
+            print(f"[ADC] {timestamp_ns}: X={x}, Y={y}, Z={z}")
 
             # Wait for next sample interval
             time.sleep(interval.value)
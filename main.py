@@ -8,6 +8,7 @@ import RPi.GPIO as GPIO
 from camera_worker import run_camera
 from mag_worker import run_adc
 from spatial_worker import run_spatial, wait_for_satellites
+from session_store import new_session_id
 import serial
 import math as m
 
@@ -98,10 +99,13 @@ def wait_for_shutdown_button(shutdown_event):
 
 # Launch worker processes for camera, ADC, and spatial
 def launch_workers(start_event, start_time, sample_interval, max_duration, shutdown_event):
+    # All workers store their streams under one shared session ID
+    session_id = new_session_id()
+    args = (start_event, start_time, sample_interval, max_duration, shutdown_event, session_id)
     processes = [
-        Process(target=run_camera, args=(start_event, start_time, sample_interval, max_duration, shutdown_event)),
-        Process(target=run_adc, args=(start_event, start_time, sample_interval, max_duration, shutdown_event)),
-        Process(target=run_spatial, args=(start_event, start_time, sample_interval, max_duration, shutdown_event))
+        Process(target=run_camera, args=args),
+        Process(target=run_adc, args=args),
+        Process(target=run_spatial, args=args)
     ]
     for p in processes:
         p.start()
@@ -109,7 +113,7 @@ def launch_workers(start_event, start_time, sample_interval, max_duration, shutd
     time.sleep(2)  # Small delay before starting timestamp
     start_time.value = time.time()
     start_event.set()
-    print(f"[Main] Workers started at {time.ctime(start_time.value)}")
+    print(f"[Main] Workers started at {time.ctime(start_time.value)}, session {session_id}")
     return processes
 
 # Main control loop
@@ -0,0 +1,209 @@
+import csv
+import math
+import os
+import sys
+import threading
+from datetime import datetime
+
+RAW_BUFFER_SIZE = 1024 * 1024              # Bytes collected in memory before an early flush
+RAW_PREALLOCATE_SIZE = 64 * 1024 * 1024    # Bytes reserved on disk at a time
+RAW_FSYNC_INTERVAL = 1.0                   # Seconds of data at most lost on power loss
+RAW_PACKET_TAIL = 5 + 255                  # Largest ANPP packet, header and data
+
+
+# Records a raw ANPP byte stream to a binary file. write only appends to an
+# in-memory buffer, a background thread writes the buffer to the file, syncs
+# it to disk and reserves disk space, so the read loop never waits on the
+# storage device. Everything written is synced at least every fsync_interval
+# seconds, which bounds the data lost on power loss, and earlier once
+# buffer_size bytes are waiting. The first preallocate_size bytes are reserved
+# when the file is opened and the next ones by the flush thread. The file is a
+# plain ANPP stream, so it can be decoded offline with the anpp_packets
+# decoder, for example by export_system_state_csv.
+class RawStreamRecorder:
+    def __init__(self, path, buffer_size=RAW_BUFFER_SIZE,
+                 preallocate_size=RAW_PREALLOCATE_SIZE,
+                 fsync_interval=RAW_FSYNC_INTERVAL):
+        self.path = path
+        self.fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        self.buffer = bytearray()   # Data not handed to the flush thread yet
+        self.buffer_size = buffer_size
+        self.lock = threading.Lock()
+        self.preallocate_size = preallocate_size
+        self.allocated = 0
+        self.fsync_interval = fsync_interval
+        self.bytes_written = 0   # Bytes written to the file
+        self.syncs = 0
+        self.error = None
+        self.preallocate(preallocate_size)
+
+        self.closing = False
+        self.flush_requested = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="raw-recorder", daemon=True)
+        self.thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def bytes_recorded(self):
+        return self.bytes_written + len(self.buffer)
+
+    def preallocate(self, size):
+        # Reserve disk space ahead, where the file system supports it
+        try:
+            os.posix_fallocate(self.fd, self.allocated, size)
+            self.allocated += size
+        except (AttributeError, OSError):
+            self.preallocate_size = 0
+
+    def write(self, data):
+        """Records raw bytes as received from the device"""
+        if self.error is not None:
+            raise self.error
+        with self.lock:
+            self.buffer += data
+            waiting = len(self.buffer)
+        if waiting >= self.buffer_size:
+            self.flush_requested.set()
+
+    def write_packet(self, an_packet):
+        """Records one validated packet, header followed by data. The header
+        holds the packet length, so the file stays a decodable ANPP stream."""
+        self.write(bytes(an_packet.header) + bytes(an_packet.data))
+
+    def run(self):
+        try:
+            while True:
+                self.flush_requested.wait(self.fsync_interval)
+                self.flush_requested.clear()
+                closing = self.closing
+                self.sync()
+                if closing:
+                    return
+        except OSError as e:
+            print(f"[Raw] Writing {self.path} failed: {e}")
+            self.error = e
+
+    def write_to_file(self, data):
+        end = self.bytes_written + len(data)
+        if self.preallocate_size and end > self.allocated:
+            self.preallocate(max(self.preallocate_size, end - self.allocated))
+        with memoryview(data) as view:
+            while view:
+                written = os.write(self.fd, view)
+                view = view[written:]
+        self.bytes_written = end
+
+    def sync(self):
+        # Takes the buffered data, writes it out and syncs the file to disk
+        with self.lock:
+            data, self.buffer = self.buffer, bytearray()
+        if data:
+            self.write_to_file(data)
+        os.fsync(self.fd)
+        self.syncs += 1
+
+    def close(self):
+        """Writes and syncs everything recorded and closes the file"""
+        if self.fd is None:
+            return
+        self.closing = True
+        self.flush_requested.set()
+        self.thread.join()
+        if self.error is None:
+            self.sync()
+        # Drop the preallocated space that was not used
+        os.ftruncate(self.fd, self.bytes_written)
+        os.close(self.fd)
+        self.fd = None
+
+
+# Read a recorded stream, without the zero filled tail of space that was
+# preallocated but not written before power was lost. The zeros after the
+# last non-zero byte are kept up to the size of one packet, in case the last
+# packet ends in zeros.
+def read_raw_stream(raw_path):
+    with open(raw_path, "rb") as raw_file:
+        data = raw_file.read()
+
+    end = len(data)
+    while end:
+        start = max(0, end - RAW_BUFFER_SIZE)
+        kept = len(data[start:end].rstrip(b"\0"))
+        if kept:
+            end = start + kept
+            break
+        end = start
+    end = min(len(data), end + RAW_PACKET_TAIL)
+    return data if end == len(data) else data[:end]
+
+
+# Decode the system state packets of a recorded stream into the spatial CSV format
+def export_system_state_csv(raw_path, csv_path):
+    from anpp_packets.an_packet_arrays import read_system_state_log
+
+    states = read_system_state_log(read_raw_stream(raw_path))
+
+    with open(csv_path, "w", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(['timestamp', 'latitude', 'longitude', 'height', 'roll', 'pitch', 'satellites'])
+        for state in states:
+            timestamp = datetime.fromtimestamp(
+                state["unix_time_seconds"] + state["microseconds"] * 1e-6
+            ).isoformat()
+            writer.writerow([
+                timestamp,
+                math.degrees(state["latitude"]),
+                math.degrees(state["longitude"]),
+                float(state["height"]),
+                math.degrees(state["orientation"][0]),
+                math.degrees(state["orientation"][1]),
+                "",
+            ])
+    return len(states)
+
+
+# Decode the system state packets of a recorded stream into a columnar spatial
+# log, with the columns of the spatial worker. The format follows the extension
+# of log_path, ".arrow" or ".parquet".
+def export_system_state_log(raw_path, log_path):
+    import numpy as np
+    from anpp_packets.an_packet_arrays import read_system_state_log
+    from columnar_log_writer import ColumnarLogWriter
+    from spatial_worker import SPATIAL_LOG_COLUMNS
+
+    states = read_system_state_log(read_raw_stream(raw_path))
+
+    timestamp_ns = (
+        states["unix_time_seconds"].astype(np.int64) * 1_000_000_000
+        + states["microseconds"].astype(np.int64) * 1000
+    )
+    columns = [
+        timestamp_ns,
+        np.degrees(states["latitude"]),
+        np.degrees(states["longitude"]),
+        states["height"],
+        np.degrees(states["orientation"][:, 0]),
+        np.degrees(states["orientation"][:, 1]),
+    ]
+    log_format = "parquet" if log_path.endswith(".parquet") else "arrow"
+    metadata = {"stream": "spatial", "source": os.path.basename(raw_path)}
+    with ColumnarLogWriter(log_path, SPATIAL_LOG_COLUMNS, format=log_format,
+                           metadata=metadata) as writer:
+        writer.write_columns(columns)
+    return len(states)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python raw_recorder.py <spatial_raw.anpp> <spatial_log.csv|.arrow|.parquet>")
+        sys.exit(1)
+    if sys.argv[2].endswith((".arrow", ".parquet")):
+        count = export_system_state_log(sys.argv[1], sys.argv[2])
+    else:
+        count = export_system_state_csv(sys.argv[1], sys.argv[2])
+    print(f"Exported {count} system state packets to {sys.argv[2]}")
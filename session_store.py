@@ -0,0 +1,154 @@
+import json
+import os
+import time
+from datetime import datetime
+import numpy as np
+
+SESSION_ROOT = "/media/bird/LOGGER1/sessions"   # Every stream of a session is stored here
+SESSION_CAPACITY = 65536      # Rows preallocated per stream at a time
+SESSION_SYNC_INTERVAL = 1.0   # Seconds of rows at most lost on power loss
+STRING_SIZE = 64              # Bytes stored for str columns
+
+
+# Session ID shared by every worker, the start time of the session
+def new_session_id():
+    return datetime.now().strftime("%Y%m%d_%H%M%S")
+
+
+# Folder of a session, created on first use
+def session_folder(session_id, root=SESSION_ROOT):
+    folder = os.path.join(root, session_id)
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+# NumPy record type of a stream, from (name, type) column pairs as used by
+# log_writer.open_log. str columns are stored as fixed size bytes.
+def stream_dtype(columns):
+    return np.dtype([
+        (name, f"S{STRING_SIZE}" if type_ is str else type_) for name, type_ in columns
+    ])
+
+
+# One stream of a session container. Rows are stored as fixed size records in a
+# preallocated, memory-mapped file <name>.bin, written in place without any
+# formatting. Space for capacity rows is reserved at a time and the mapping is
+# extended when it is full. The manifest <name>.json holds the record type, the
+# session ID and the number of rows synced to disk; it is rewritten atomically
+# on every sync, at most every sync_interval seconds. Each worker process
+# writes its own stream, so no locking is needed between processes.
+class SessionStreamWriter:
+    def __init__(self, folder, name, columns, metadata=None, capacity=SESSION_CAPACITY,
+                 sync_interval=SESSION_SYNC_INTERVAL):
+        self.name = name
+        self.path = os.path.join(folder, name + ".bin")
+        self.manifest_path = os.path.join(folder, name + ".json")
+        self.dtype = stream_dtype(columns)
+        self.metadata = {key: str(value) for key, value in (metadata or {}).items()}
+        self.capacity_step = capacity
+        self.capacity = 0
+        self.count = 0
+        self.sync_interval = sync_interval
+        self.last_sync = time.monotonic()
+        self.syncs = 0
+
+        self.file = open(self.path, "w+b")
+        self.rows = None
+        self.grow()
+        self.write_manifest()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def rows_written(self):
+        return self.count
+
+    def grow(self):
+        # Sync the current mapping, then reserve and map capacity_step more rows
+        if self.rows is not None:
+            self.rows.flush()
+        self.capacity += self.capacity_step
+        size = self.capacity * self.dtype.itemsize
+        self.file.truncate(size)
+        try:
+            os.posix_fallocate(self.file.fileno(), 0, size)
+        except (AttributeError, OSError):
+            pass
+        self.rows = np.memmap(self.file, dtype=self.dtype, mode="r+", shape=(self.capacity,))
+
+    def writerow(self, row):
+        """Stores a row of values in column order"""
+        if self.count == self.capacity:
+            self.grow()
+        self.rows[self.count] = tuple(row)
+        self.count += 1
+
+        if time.monotonic() - self.last_sync >= self.sync_interval:
+            self.sync()
+
+    def write_manifest(self, closed=False):
+        manifest = {
+            "stream": self.name,
+            **self.metadata,
+            "dtype": self.dtype.descr,
+            "rows": self.count,
+            "closed": closed,
+        }
+        temporary_path = self.manifest_path + ".tmp"
+        with open(temporary_path, "w") as manifest_file:
+            json.dump(manifest, manifest_file)
+            manifest_file.flush()
+            os.fsync(manifest_file.fileno())
+        os.replace(temporary_path, self.manifest_path)
+
+    def sync(self):
+        """Syncs the stored rows to disk, then records their number in the manifest"""
+        self.rows.flush()
+        self.write_manifest()
+        self.last_sync = time.monotonic()
+        self.syncs += 1
+
+    def close(self):
+        """Syncs every row and drops the reserved space that was not used"""
+        if self.file.closed:
+            return
+        self.rows.flush()
+        self.rows = None
+        self.file.truncate(self.count * self.dtype.itemsize)
+        os.fsync(self.file.fileno())
+        self.file.close()
+        self.write_manifest(closed=True)
+
+
+# Read one stream of a session. The rows are memory-mapped, read only, up to the
+# last sync recorded in the manifest.
+def read_session_stream(folder, name):
+    with open(os.path.join(folder, name + ".json")) as manifest_file:
+        manifest = json.load(manifest_file)
+    dtype = np.dtype([tuple(field) for field in manifest["dtype"]])
+    if not manifest["rows"]:
+        return np.empty(0, dtype=dtype), manifest
+    rows = np.memmap(os.path.join(folder, name + ".bin"), dtype=dtype, mode="r",
+                     shape=(manifest["rows"],))
+    return rows, manifest
+
+
+# Read every stream of a session, keyed by stream name
+def read_session(folder):
+    streams = {}
+    for filename in sorted(os.listdir(folder)):
+        name, extension = os.path.splitext(filename)
+        if extension == ".json":
+            streams[name] = read_session_stream(folder, name)[0]
+    return streams
+
+
+# Index of the row of reference at or before each timestamp, for joining two
+# streams on their timestamp_ns columns. Timestamps before the first row of
+# reference give -1.
+def join_index(reference, timestamps_ns):
+    return np.searchsorted(reference["timestamp_ns"], timestamps_ns, side="right") - 1
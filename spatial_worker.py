@@ -1,11 +1,38 @@
-import datetime
 import time
 import math
-import csv
 import os
 import an_devices.spatial_device as spatial_device
 from anpp_packets.an_packet_protocol import ANPacket
 from anpp_packets.an_packets import PacketID
+from raw_recorder import RawStreamRecorder
+from log_writer import CSVLayout, iso_timestamp, open_log
+from session_store import new_session_id, session_folder
+
+DECODER_CAPACITY = 256 * 1024  # Fixed decoder buffer size in bytes
+STATISTICS_INTERVAL = 10.0     # Seconds between decoder statistics printouts
+PACKET_WAIT = 0.1              # Seconds to wait for packets from the reader thread
+RECORD_RAW_STREAM = True       # Also record the raw ANPP stream next to the log
+
+# Columns of the spatial log, see log_writer.open_log
+SPATIAL_LOG_COLUMNS = [
+    ("timestamp_ns", "int64"),
+    ("latitude", "float64"),
+    ("longitude", "float64"),
+    ("height", "float64"),
+    ("roll", "float32"),
+    ("pitch", "float32"),
+]
+
+# Spatial log row in the CSV layout, with an ISO timestamp and an empty satellites column
+def spatial_csv_row(row):
+    timestamp_ns, lat, lon, height, roll, pitch = row
+    return [iso_timestamp(timestamp_ns), lat, lon, height, roll, pitch, ""]
+
+SPATIAL_CSV_LAYOUT = CSVLayout(
+    "spatial_log.csv",
+    ['timestamp', 'latitude', 'longitude', 'height', 'roll', 'pitch', 'satellites'],
+    spatial_csv_row,
+)
 
 # Function to wait for sufficient satellites before starting logging
 def wait_for_satellites(sat_ready_event, sat_count, shutdown_event):
@@ -26,62 +53,67 @@ def wait_for_satellites(sat_ready_event, sat_count, shutdown_event):
 
     spatial.get_device_and_configuration_information()
     spatial.request_packet(PacketID.satellites)
+    spatial.decoder.subscribe([PacketID.satellites])
+    spatial.start_reader()
 
     print("[Spatial] Waiting for >5 satellites...")
 
     # Continuously check satellite count
     while not sat_ready_event.is_set() and not shutdown_event.is_set():
-        # Read incoming data if available
-        if spatial.ser and spatial.ser.is_open and spatial.in_waiting() > 0:
-            data = spatial.read(spatial.in_waiting())
-            spatial.decoder.add_data(packet_bytes=data)
-
-        # Decode satellite packet
-        if len(spatial.decoder.buffer) > 0:
-            pkt = spatial.decoder.decode()
-            if pkt and pkt.id == PacketID.satellites:
-                sp = spatial_device.SatellitesPacket()
-                if sp.decode(pkt) == 0:
-                    total = (
-                        sp.gps_satellites + sp.glonass_satellites +
-                        sp.beidou_satellites + sp.galileo_satellites +
-                        sp.sbas_satellites
-                    )
-                    sat_count.value = total
-                    print(f"[Spatial] Satellites: {total}")
-                    if total >= 5:
-                        print("[Spatial] Satellite lock acquired.")
-                        sat_ready_event.set()
-        time.sleep(0.1)  # Small delay to avoid busy waiting
+        # Satellite packets are read and decoded by the reader thread
+        for sp in spatial.iter_packets(timeout=PACKET_WAIT):
+            if isinstance(sp, spatial_device.SatellitesPacket):
+                total = (
+                    sp.gps_satellites + sp.glonass_satellites +
+                    sp.beidou_satellites + sp.galileo_satellites +
+                    sp.sbas_satellites
+                )
+                sat_count.value = total
+                print(f"[Spatial] Satellites: {total}")
+                if total >= 5:
+                    print("[Spatial] Satellite lock acquired.")
+                    sat_ready_event.set()
+    spatial.stop_reader()
 
 # Main function to log data from spatial device
-def run_spatial(start_event, start_time, interval, max_duration, shutdown_event):
+def run_spatial(start_event, start_time, interval, max_duration, shutdown_event, session_id=None):
     comport = "/dev/ttyUSB0"
     baudrate = "460800"
-    spatial = spatial_device.Spatial(comport, int(baudrate))
+    spatial = spatial_device.Spatial(
+        comport, int(baudrate), DECODER_CAPACITY, decoder_zero_copy=True
+    )
 
     if not spatial.is_open:
         print("[Spatial] Not connected.")
         return
 
-    # Create folder structure for logging data
-    base_folder = "/media/bird/LOGGER1/spatial"
-    folder = os.path.join(base_folder, datetime.datetime.now().strftime("%Y%m%d_%H%M%S"))
-    os.makedirs(folder, exist_ok=True)
-    csv_path = os.path.join(folder, "spatial_log.csv")
-    
+    # Only system state packets are logged, skip everything else undecoded
+    spatial.decoder.subscribe([PacketID.system_state])
+
+    # Data is stored in the session folder shared by all workers
+    session_id = session_id or new_session_id()
+    folder = session_folder(session_id)
+
+    # Open the log in LOG_FORMAT, see log_writer.open_log for how rows reach disk
+    writer = open_log(folder, "spatial", SPATIAL_LOG_COLUMNS,
+                      metadata={"session": session_id}, csv_layout=SPATIAL_CSV_LAYOUT)
+
+    # Record every byte read alongside the log, so all packets can be decoded
+    # offline with python raw_recorder.py <spatial_raw.anpp> <spatial_log.csv>
+    recorder = None
+    if RECORD_RAW_STREAM:
+        recorder = RawStreamRecorder(os.path.join(folder, "spatial_raw.anpp"))
+
     try:
-        # Open CSV file and write header
-        csv_file = open(csv_path, "w", newline="")
-        writer = csv.writer(csv_file)
-        writer.writerow(['timestamp', 'latitude', 'longitude', 'height', 'roll', 'pitch', 'satellites'])
 
         # Wait for external start signal
         start_event.wait()
+        spatial.start_reader(raw_sink=recorder)
         base_time = start_time.value
         print(f"[Spatial] Logging started at: {time.ctime(base_time)}")
 
         last_log = 0.0  # Initialize last log timestamp
+        last_statistics = time.time()
 
         # Main logging loop
         while spatial.is_open and not shutdown_event.is_set():
@@ -92,34 +124,42 @@ def run_spatial(start_event, start_time, interval, max_duration, shutdown_event)
                 print("[Spatial] Max duration reached.")
                 break
 
-            # Read new data from serial buffer
-            if spatial.ser and spatial.ser.is_open and spatial.in_waiting() > 0:
-                data = spatial.read(spatial.in_waiting())
-                spatial.decoder.add_data(packet_bytes=data)
-
-            # Decode system state packets
-            if len(spatial.decoder.buffer) > 0:
-                pkt = spatial.decoder.decode()
-                if pkt and pkt.id == PacketID.system_state:
-                    state = spatial_device.SystemStatePacket()
-                    if state.decode(pkt) != 0:
-                        print("[Spatial] Failed to decode system_state packet.")
-                        continue
-
-                    # Log data at defined interval
-                    if (now - last_log) >= interval.value:
-                        lat = math.degrees(state.latitude)
-                        lon = math.degrees(state.longitude)
-                        roll = math.degrees(state.orientation[0])
-                        pitch = math.degrees(state.orientation[1])
-                        timestamp = datetime.datetime.now().isoformat()
-
-                        writer.writerow([timestamp, lat, lon, state.height, roll, pitch, ""])
-                        csv_file.flush()  # Immediately write data to file
-                        print(f"[Spatial] {timestamp}: Lat {lat:.6f} Lon {lon:.6f} Height {state.height:.2f} Roll {roll:.2f} Pitch {pitch:.2f}")
-                        last_log = now
+            # Report whether decoding keeps up with the serial stream
+            if now - last_statistics >= STATISTICS_INTERVAL:
+                print(f"[Spatial] Decoder: {spatial.decoder.statistics()}")
+                print(f"[Spatial] Dropped packets: {spatial.dropped_packets}")
+                if spatial.raw_sink_error is not None:
+                    print(f"[Spatial] Raw recording stopped: {spatial.raw_sink_error}")
+                elif recorder is not None:
+                    print(f"[Spatial] Recorded {recorder.bytes_recorded} bytes")
+                last_statistics = now
+
+            # Wait for system state packets read and decoded by the reader thread
+            for state in spatial.iter_packets(timeout=PACKET_WAIT):
+                if not isinstance(state, spatial_device.SystemStatePacket):
+                    continue
+
+                # Log data at defined interval
+                now = time.time()
+                if (now - last_log) >= interval.value:
+                    lat = math.degrees(state.latitude)
+                    lon = math.degrees(state.longitude)
+                    roll = math.degrees(state.orientation[0])
+                    pitch = math.degrees(state.orientation[1])
+                    timestamp_ns = time.time_ns()
+
+                    writer.writerow([timestamp_ns, lat, lon, state.height, roll, pitch])
+                    print(f"[Spatial] {timestamp_ns}: Lat {lat:.6f} Lon {lon:.6f} Height {state.height:.2f} Roll {roll:.2f} Pitch {pitch:.2f}")
+                    last_log = now
     finally:
-        # Close files and serial connection safely
-        csv_file.close()
+        # Commit remaining rows, stop the reader and close serial connection safely
         spatial.close()
-        print(f"[Spatial] Data saved to {csv_path}")
+        writer.close()
+        if recorder is not None:
+            # A failed recording must not hide the log, which is already closed
+            try:
+                recorder.close()
+                print(f"[Spatial] Raw stream saved to {recorder.path}")
+            except OSError as e:
+                print(f"[Spatial] Raw stream {recorder.path} incomplete: {e}")
+        print(f"[Spatial] Data saved to {writer.path}")